@@ -1,4 +1,3 @@
-import aiohttp
 import asyncio
 import os
 from dotenv import load_dotenv
@@ -9,25 +8,33 @@ from form_handling.formdetection import fill_all_forms
 load_dotenv()
 api_key = os.getenv("OPENAI_API_KEY")
 
-# Set human-like User-Agent
-USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36"
-
-
-import httpx
 import json
 import logging
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
+
+from agent.html_document import HTMLDocument
+from agent.http_client import get_http_client
+from utils.blocking import run_blocking
+
+
+def page_scripts(html):
+    """Returns the inline script bodies of an HTML page."""
+    return HTMLDocument(html).scripts()
+
 
 class APIExtractor:
-    def __init__(self):
-        self.session = httpx.AsyncClient(timeout=10.0)
+    def __init__(self, http=None):
+        self.http = http or get_http_client()
 
-    async def extract(self, url):
+    async def extract(self, url, deadline=None):
+        """`deadline` (an agent.deadline.Deadline) bounds the request; otherwise the client's timeout applies."""
         print(f"[INFO] Checking {url} for API access...")
 
         try:
-            response = await self.session.get(url)
+            if deadline is not None:
+                response = await self.http.get(url, timeout=deadline.remaining(floor=0.1))
+            else:
+                response = await self.http.get(url)
             content_type = response.headers.get("Content-Type", "")
 
             if "application/json" in content_type or "application/vnd.api+json" in content_type:
@@ -51,16 +58,13 @@ class APIExtractor:
             return None
 
     async def _extract_from_html(self, base_url, html):
-        soup = BeautifulSoup(html, "html.parser")
-        scripts = soup.find_all("script")
+        scripts = await run_blocking(page_scripts, html)
 
         api_candidates = []
 
         for script in scripts:
-            if not script.string:
-                continue
-            if "fetch(" in script.string or "axios." in script.string:
-                api_candidates.append(script.string)
+            if "fetch(" in script or "axios." in script:
+                api_candidates.append(script)
 
         if api_candidates:
             print(f"[INFO] Found {len(api_candidates)} API-related scripts.")
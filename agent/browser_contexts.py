@@ -0,0 +1,142 @@
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+
+class BrowserTab:
+    """A driver-like handle for one tab living in its own isolated browser context.
+
+    Several tabs share one Chrome (and one chromedriver session), so every
+    command takes the browser lock and focuses this tab first. Navigation goes
+    through CDP `Page.navigate` so a slow page load does not hold the lock and
+    stall the other tabs of the same browser.
+    """
+
+    def __init__(self, host, handle, context_id):
+        self._host = host
+        self._handle = handle
+        self.context_id = context_id
+
+    def _focus(self):
+        driver = self._host.driver
+        if driver.current_window_handle != self._handle:
+            driver.switch_to.window(self._handle)
+
+    def get(self, url, timeout=30):
+        with self._host.lock:
+            self._focus()
+            result = self._host.driver.execute_cdp_cmd("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            # otherwise Chrome's error page loads to "complete" and gets scraped as content
+            raise WebDriverException(f"Navigation to {url} failed: {result['errorText']}")
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._host.lock:
+                self._focus()
+                state = self._host.driver.execute_script("return document.readyState")
+            if state == "complete":
+                return
+            time.sleep(0.1)
+        raise TimeoutException(f"Page did not load within {timeout}s: {url}")
+
+    def __getattr__(self, name):
+        driver = self._host.driver
+        if isinstance(getattr(type(driver), name, None), property):
+            with self._host.lock:
+                self._focus()
+                return getattr(driver, name)
+
+        value = getattr(driver, name)
+        if not callable(value):
+            return value
+
+        def call(*args, **kwargs):
+            with self._host.lock:
+                self._focus()
+                return value(*args, **kwargs)
+
+        return call
+
+
+class _BrowserHost:
+    def __init__(self, driver, page_budget):
+        self.driver = driver
+        self.lock = threading.RLock()
+        self.anchor = driver.current_window_handle
+        self.open_tabs = 0
+        self.pages = 0
+        self.page_budget = page_budget  # pages left before the pool recycles this Chrome
+        self.broken = False
+
+    def has_capacity(self, tabs_per_browser):
+        # stop handing out tabs once the budget is spoken for, so the host drains and goes back to the pool
+        return (not self.broken and self.open_tabs < tabs_per_browser
+                and self.pages + self.open_tabs < self.page_budget)
+
+
+class BrowserContextMultiplexer:
+    """Runs up to `tabs_per_browser` isolated pages inside each pooled Chrome.
+
+    Every tab gets a fresh CDP browser context (its own cookie jar and
+    storage), which is disposed as soon as the tab is closed. Browsers are
+    borrowed from a BrowserPool and handed back once all their tabs are gone.
+    """
+
+    def __init__(self, pool, tabs_per_browser=6):
+        self.pool = pool
+        self.tabs_per_browser = tabs_per_browser
+        self._hosts = []
+        self._lock = threading.Lock()
+
+    def _host_with_capacity(self, timeout=None):
+        with self._lock:
+            for host in self._hosts:
+                if host.has_capacity(self.tabs_per_browser):
+                    host.open_tabs += 1
+                    return host
+
+        driver = self.pool.acquire(timeout=timeout)
+        host = _BrowserHost(driver, max(1, self.pool.pages_left(driver)))
+        host.open_tabs = 1
+        with self._lock:
+            self._hosts.append(host)
+        return host
+
+    def open_tab(self, timeout=None):
+        """A new isolated tab; waits at most `timeout` seconds (None: forever) for a browser."""
+        host = self._host_with_capacity(timeout)
+        try:
+            with host.lock:
+                context = host.driver.execute_cdp_cmd("Target.createBrowserContext", {"disposeOnDetach": False})
+                target = host.driver.execute_cdp_cmd("Target.createTarget", {
+                    "url": "about:blank",
+                    "browserContextId": context["browserContextId"],
+                })
+        except Exception as e:
+            self._release_slot(host, broken=isinstance(e, WebDriverException))
+            raise
+        return BrowserTab(host, target["targetId"], context["browserContextId"])
+
+    def close_tab(self, tab, broken=False):
+        host = tab._host
+        try:
+            with host.lock:
+                host.driver.execute_cdp_cmd("Target.closeTarget", {"targetId": tab._handle})
+                host.driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": tab.context_id})
+                host.driver.switch_to.window(host.anchor)
+        except Exception as e:
+            print(f"[WARN] Failed to close browser context: {e}")
+            broken = True
+        self._release_slot(host, broken=broken)
+
+    def _release_slot(self, host, broken=False):
+        with self._lock:
+            host.open_tabs -= 1
+            host.pages += 1
+            host.broken = host.broken or broken
+            if host.open_tabs > 0:
+                return
+            self._hosts.remove(host)
+        self.pool.release(host.driver, broken=host.broken, pages=host.pages)
@@ -3,26 +3,75 @@ import logging
 import random
 import platform
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.common.exceptions import MoveTargetOutOfBoundsException, TimeoutException
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import MoveTargetOutOfBoundsException, TimeoutException, WebDriverException
 
 from undetected_chromedriver import Chrome, ChromeOptions
 from webdriver_manager.chrome import ChromeDriverManager
 
+from agent.browser_contexts import BrowserContextMultiplexer, BrowserTab
+from agent.browser_pool import BrowserPool
 from agent.dom_scraper import DOMScraper
+from agent.html_document import HTMLDocument
+from agent.http_client import USER_AGENT
+from agent.page_readiness import READY_TIMEOUT, wait_for_page_ready
+from agent.render_profile import HEADLESS_TEXT_PROFILE
 from form_handling.formdetection import fill_all_forms, gather_forms_from_dom
+from utils.blocking import run_blocking
+
+POOL_SIZE = 2  # warm Chrome instances kept alive between URLs
+MAX_PAGES_PER_BROWSER = 25  # recycle a Chrome after this many pages
+TABS_PER_BROWSER = 6  # isolated browser contexts per Chrome; 1 = one Chrome per URL
+PAGE_LOAD_TIMEOUT = 30.0  # seconds, when open() is called without a deadline
+WARM_ON_START = True  # start the pool's browsers in the background so the first URLs skip Chrome startup
+HUMANLIKE_MOVES = False  # random mouse moves with pauses; only needed for bot-sensitive sites
+
+
+@lru_cache(maxsize=1)
+def install_chromedriver():
+    """Resolves the ChromeDriver binary once per process instead of once per URL."""
+    return ChromeDriverManager().install()
 
-USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36"
 
 class BrowserController:
-    def __init__(self):
-        pass  # removed self.driver as it's now locally scoped
+    def __init__(self, pool=None, tabs_per_browser=TABS_PER_BROWSER, profile=HEADLESS_TEXT_PROFILE, http=None,
+                 warm=WARM_ON_START):
+        self.profile = profile
+        self.scraper = DOMScraper(http)
+        self.pool = pool or BrowserPool(self.configure_driver, size=POOL_SIZE, max_pages=MAX_PAGES_PER_BROWSER)
+        self.contexts = BrowserContextMultiplexer(self.pool, tabs_per_browser) if tabs_per_browser > 1 else None
+        # Dedicated threads so long browser sessions never starve the shared blocking pool
+        self.executor = ThreadPoolExecutor(max_workers=self.pool.size * max(tabs_per_browser, 1),
+                                           thread_name_prefix="ax-browser")
+        if warm:
+            self.executor.submit(self._warm)
+
+    def _warm(self):
+        try:
+            self.pool.warm()
+        except Exception as e:
+            print(f"[WARN] Browser pool: warm-up failed, browsers will start on demand: {e}")
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.pool.close()
+
+    def _checkout(self, timeout=None):
+        if self.contexts:
+            return self.contexts.open_tab(timeout=timeout)
+        return self.pool.acquire(timeout=timeout)
+
+    def _checkin(self, driver, broken=False):
+        if self.contexts:
+            self.contexts.close_tab(driver, broken=broken)
+        else:
+            self.pool.release(driver, broken=broken)
 
     @staticmethod
+    @lru_cache(maxsize=1)
     def get_local_chrome_version():
         system = platform.system()
         if system == "Windows":
@@ -60,10 +109,11 @@ class BrowserController:
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--disable-webrtc")
         options.add_argument(f"user-agent={USER_AGENT}")
+        self.profile.apply_options(options)
 
         for attempt in range(1, max_retries + 1):
             try:
-                driver_path = ChromeDriverManager().install()
+                driver_path = install_chromedriver()
                 print(f"[INFO] Attempt {attempt}: Using ChromeDriver: {driver_path}")
 
                 chrome_version = self.get_local_chrome_version()
@@ -76,36 +126,61 @@ class BrowserController:
 
             except Exception as e:
                 print(f"[WARN] ChromeDriver setup failed on attempt {attempt}: {e}")
+                install_chromedriver.cache_clear()
+                self.get_local_chrome_version.cache_clear()
                 time.sleep(2)  # small delay before retry
 
         raise RuntimeError("Failed to configure ChromeDriver after multiple attempts.")
 
 
-    async def open(self, url, fill_forms=False):
+    async def open(self, url, fill_forms=False, ready_timeout=READY_TIMEOUT, deadline=None):
+        """`deadline` (an agent.deadline.Deadline) bounds page load, readiness and the static fetch."""
+        return await run_blocking(self._open_sync, url, fill_forms, ready_timeout, deadline, executor=self.executor)
+
+    @staticmethod
+    def _navigate(driver, url, timeout):
+        if isinstance(driver, BrowserTab):
+            driver.get(url, timeout=timeout)
+        else:
+            driver.set_page_load_timeout(timeout)
+            driver.get(url)
+
+    def _open_sync(self, url, fill_forms, ready_timeout, deadline=None):
         driver = None
+        broken = False
         try:
-            driver = self.configure_driver()
+            driver = self._checkout(deadline.remaining() if deadline else None)
+            if deadline is not None and deadline.expired:
+                # the caller has already given up on this attempt; don't spend a page on it
+                raise TimeoutException(f"Deadline passed while waiting for a browser for {url}")
             print(f"[INFO] Launching browser to access: {url}")
-            driver.get(url)
-
-            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            print("[INFO] Page loaded.")
-
-            # Simulate human-like movement
-            window_size = driver.get_window_size()
-            actions = ActionChains(driver)
-            for _ in range(random.randint(3, 7)):
-                try:
-                    actions.move_by_offset(
-                        random.randint(-window_size["width"] // 2, window_size["width"] // 2),
-                        random.randint(-window_size["height"] // 2, window_size["height"] // 2)
-                    ).perform()
-                    time.sleep(random.uniform(0.5, 1.2))
-                except MoveTargetOutOfBoundsException:
-                    continue
+            self.profile.apply_to_driver(driver, url)
+            self._navigate(driver, url, deadline.remaining(floor=1.0) if deadline else PAGE_LOAD_TIMEOUT)
+
+            if deadline is not None:
+                ready_timeout = deadline.remaining(cap=ready_timeout)
+            ready_wait = wait_for_page_ready(driver, timeout=ready_timeout)
+            print(f"[INFO] Page ready after {ready_wait}s.")
+
+            if HUMANLIKE_MOVES:
+                # Simulate human-like movement
+                window_size = driver.get_window_size()
+                actions = ActionChains(driver)
+                for _ in range(random.randint(3, 7)):
+                    try:
+                        actions.move_by_offset(
+                            random.randint(-window_size["width"] // 2, window_size["width"] // 2),
+                            random.randint(-window_size["height"] // 2, window_size["height"] // 2)
+                        ).perform()
+                        time.sleep(random.uniform(0.5, 1.2))
+                    except MoveTargetOutOfBoundsException:
+                        continue
+
+            # Parse the rendered page once; forms and text both come from this tree
+            document = HTMLDocument(driver.page_source)
 
             # Detect forms
-            forms = gather_forms_from_dom(driver)
+            forms = gather_forms_from_dom(driver, document=document)
             """if forms:
                 print(f"[INFO] {len(forms)} form(s) detected on the page.")
                 if fill_forms:
@@ -121,14 +196,18 @@ class BrowserController:
 
 
             # Scrape DOM content
-            scraper = DOMScraper()
-            content, _ = scraper.scrape_page(driver)
+            content, _ = self.scraper.scrape_page(driver, document=document, deadline=deadline)
+
+            # Free the tab/context as soon as scraping is done
+            self._checkin(driver)
+            driver = None
 
             return {
                 "content": content,
                 "status": "Completed",
                 "success": bool(content and content.strip()),
-                "form_detected": bool(forms)
+                "form_detected": bool(forms),
+                "ready_wait": ready_wait
             }
 
 
@@ -138,11 +217,13 @@ class BrowserController:
 
         except Exception as e:
             print(f"[ERROR] Exception during browser session: {e}")
+            # a slow page is no reason to throw away a warm browser (or its other tabs)
+            broken = isinstance(e, WebDriverException) and not isinstance(e, TimeoutException)
             return {"success": False, "status": str(e), "content": ""}
 
         finally:
             if driver:
-                driver.quit()
+                self._checkin(driver, broken=broken)
             if not locals().get("content"):
                 return {"success": False, "status": "Unknown error", "content": ""}
 
@@ -0,0 +1,126 @@
+import queue
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+
+RECHECK_INTERVAL = 0.5  # seconds between spawn attempts while waiting for a driver
+
+
+class BrowserPool:
+    """Keeps a bounded set of warm Chrome drivers and hands them out per URL.
+
+    Drivers are reset (cookies, storage, extra windows, navigation) when they
+    come back, and are recycled after `max_pages` pages or when a session
+    crashes, so one bad page cannot poison the next URL.
+    """
+
+    def __init__(self, factory, size=2, max_pages=25):
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._pages = {}
+        self._closed = False
+
+    def warm(self, count=None):
+        """Starts drivers up front so the first URLs skip Chrome startup."""
+        count = self.size if count is None else min(count, self.size)
+        while self._created < count:
+            driver = self._spawn()
+            if driver is None:
+                break
+            self._idle.put(driver)
+
+    def _spawn(self):
+        with self._lock:
+            if self._closed or self._created >= self.size:
+                return None
+            self._created += 1
+        try:
+            driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        self._pages[id(driver)] = 0
+        print(f"[INFO] Browser pool: started driver {self._created}/{self.size}")
+        return driver
+
+    def acquire(self, timeout=None):
+        if self._closed:
+            raise RuntimeError("Browser pool is closed.")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            driver = self._spawn()
+            if driver is not None:
+                return driver
+            # recycled drivers free a slot without coming back through the queue, so re-check now and then
+            wait = RECHECK_INTERVAL if deadline is None else min(RECHECK_INTERVAL, deadline - time.monotonic())
+            if wait <= 0:
+                raise TimeoutException("Timed out waiting for a pooled browser.")
+            try:
+                return self._idle.get(timeout=wait)
+            except queue.Empty:
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed.")
+
+    def pages_left(self, driver):
+        """Pages `driver` may still serve before it is recycled."""
+        return max(0, self.max_pages - self._pages.get(id(driver), 0))
+
+    def release(self, driver, broken=False, pages=1):
+        pages = self._pages.get(id(driver), 0) + pages
+        self._pages[id(driver)] = pages
+
+        if self._closed or broken or pages >= self.max_pages or not self._reset(driver):
+            reason = "crashed" if broken else "recycled"
+            print(f"[INFO] Browser pool: driver {reason} after {pages} page(s)")
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    @staticmethod
+    def _reset(driver):
+        """Clears per-site state so the next URL starts from a clean profile."""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            origin = driver.execute_script("return window.location.origin")
+            if origin and origin.startswith("http"):
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            print(f"[WARN] Browser pool: reset failed: {e}")
+            return False
+
+    def _discard(self, driver):
+        self._pages.pop(id(driver), None)
+        with self._lock:
+            self._created -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
@@ -0,0 +1,72 @@
+import math
+import time
+from urllib.parse import urlparse
+
+URL_DEADLINE = 120.0  # end-to-end budget (s) for one URL, fallbacks and LLM included
+DEFAULT_TIMEOUTS = {"api": 10.0, "dom": 10.0, "browser": 60.0}  # used until a domain has history
+MAX_TIMEOUTS = {"api": 20.0, "dom": 20.0, "browser": 90.0}
+MIN_TIMEOUT = 2.0
+TIMEOUT_MARGIN = 1.5  # headroom over the domain's p95 latency
+MIN_SAMPLES = 5  # recent results needed before the p95 is trusted
+
+
+class Deadline:
+    """A fixed point in (monotonic) time shared by every step of a task.
+
+    Each step asks for `remaining()` instead of using its own constant, so a
+    slow step leaves less time for the ones after it rather than stretching
+    the whole task.
+    """
+
+    def __init__(self, seconds):
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self, cap=None, floor=0.0):
+        """Seconds left, at most `cap` and at least `floor`."""
+        left = self.expires_at - time.monotonic()
+        if cap is not None:
+            left = min(left, cap)
+        return max(left, floor)
+
+    @property
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+    def child(self, seconds):
+        """A deadline `seconds` from now, but never later than this one."""
+        child = Deadline(seconds)
+        child.expires_at = min(child.expires_at, self.expires_at)
+        child.budget = round(child.expires_at - time.monotonic(), 2)
+        return child
+
+    def __repr__(self):
+        return f"Deadline({self.remaining():.1f}s left of {self.budget}s)"
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def adaptive_timeout(memory, url, method, margin=TIMEOUT_MARGIN):
+    """Per-(domain, method) timeout from observed latency, clamped to [MIN_TIMEOUT, MAX_TIMEOUTS].
+
+    Uses p95 of the domain's recent successful runs × `margin`; with too few
+    of those, the decayed counters' mean + 2σ × `margin`; with no history,
+    DEFAULT_TIMEOUTS.
+    """
+    domain = urlparse(url.lower()).netloc
+    default = DEFAULT_TIMEOUTS.get(method, max(DEFAULT_TIMEOUTS.values()))
+    ceiling = MAX_TIMEOUTS.get(method, default)
+
+    times = [t for t in memory.get_recent_times(domain, method) if t]
+    stats = memory.get_domain_stats(domain).get(method)
+    if len(times) >= MIN_SAMPLES:
+        timeout = percentile(times, 0.95) * margin
+    elif stats and stats["total"] >= 1 and stats["mean_time"]:
+        timeout = (stats["mean_time"] + 2 * stats["time_std"]) * margin
+    else:
+        return default
+    return round(min(max(timeout, MIN_TIMEOUT), ceiling), 2)
@@ -1,42 +1,58 @@
-import time
-import requests
-from bs4 import BeautifulSoup
 from concurrent.futures import ThreadPoolExecutor
 from selenium.common.exceptions import MoveTargetOutOfBoundsException
 
+from agent.html_document import HTMLDocument
+from agent.http_client import get_http_client
+from agent.page_readiness import READY_TIMEOUT, wait_for_page_ready
+from utils.blocking import run_blocking
+
+STATIC_TIMEOUT = 10.0  # seconds for the static half of scrape_page when no deadline is given
+MIN_CONTENT_CHARS = 200  # below this the page is most likely a JS shell
+JS_REQUIRED_MARKERS = ("enable javascript", "javascript is disabled", "requires javascript", "turn on javascript")
+
+
+def extract_main_text(html):
+    """Returns the readable main content of an HTML page, without a browser."""
+    return HTMLDocument(html).main_text()
+
+
 class DOMScraper:
-    def __init__(self):
-        pass
+    def __init__(self, http=None):
+        self.http = http or get_http_client()
+
+    def scrape_page(self, driver, document=None, deadline=None):
+        """Extracts page content dynamically and statically.
 
-    def scrape_page(self, driver):
-        """Extracts page content dynamically and statically."""
+        The caller owns the driver; it is left open so pooled browsers can be reused.
+        Pass the already-parsed rendered page as `document` to avoid parsing it again.
+        `deadline` caps the static request and the readiness wait.
+        """
+        timeout = deadline.remaining(cap=STATIC_TIMEOUT, floor=0.1) if deadline else STATIC_TIMEOUT
 
         def scrape_static():
             try:
-                response = requests.get(driver.current_url)
+                # called from a browser thread: the request runs on the shared client's loop
+                response = self.http.get_sync(driver.current_url, timeout=timeout)
                 response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
-                return soup.get_text(), "Static HTML successfully scraped."
+                return HTMLDocument(response.content).text(), "Static HTML successfully scraped."
             except Exception as e:
                 return "", f"Static scrape failed: {e}"
 
         def scrape_dynamic():
             try:
-                time.sleep(3)
-                page_source = driver.page_source
-                soup = BeautifulSoup(page_source, 'html.parser')
-                return soup.get_text(), "Dynamic content successfully scraped with Selenium."
+                rendered = document
+                if rendered is None:
+                    wait_for_page_ready(driver, timeout=min(timeout, READY_TIMEOUT))
+                    rendered = HTMLDocument(driver.page_source)
+                return rendered.text(), "Dynamic content successfully scraped with Selenium."
             except Exception as e:
                 return "", f"Dynamic scrape failed: {e}"
 
-        try:
-            with ThreadPoolExecutor() as executor:
-                static_future = executor.submit(scrape_static)
-                dynamic_future = executor.submit(scrape_dynamic)
-                static_content, static_status = static_future.result()
-                dynamic_content, dynamic_status = dynamic_future.result()
-        finally:
-            driver.quit()
+        with ThreadPoolExecutor() as executor:
+            static_future = executor.submit(scrape_static)
+            dynamic_future = executor.submit(scrape_dynamic)
+            static_content, static_status = static_future.result()
+            dynamic_content, dynamic_status = dynamic_future.result()
 
         print(static_status)
         print(dynamic_status)
@@ -44,9 +60,34 @@ class DOMScraper:
         combined_content = static_content + "\n\n--- Dynamic Content ---\n\n" + dynamic_content
         return combined_content, static_status + "; " + dynamic_status
 
+    async def fetch(self, url, deadline=None):
+        """Browser-free DOM method: a plain HTTP GET followed by main-content extraction."""
+        print(f"[INFO] Fetching {url} over HTTP (no browser)...")
+        try:
+            if deadline is not None:
+                response = await self.http.get(url, timeout=deadline.remaining(floor=0.1))
+            else:
+                response = await self.http.get(url)
+            response.raise_for_status()
+        except Exception as e:
+            print(f"[ERROR] HTTP fetch failed for {url}: {e}")
+            return {"success": False, "friction": 1.5, "content": "", "status": f"HTTP fetch failed: {e}"}
+
+        if "html" not in response.headers.get("Content-Type", ""):
+            return {"success": False, "friction": 1.5, "content": "", "status": "Response is not HTML."}
+
+        content = await run_blocking(extract_main_text, response.text)
+        if len(content) < MIN_CONTENT_CHARS and any(m in content.lower() for m in JS_REQUIRED_MARKERS):
+            return {"success": False, "friction": 1.5, "content": content, "status": "Page requires JavaScript."}
+        if len(content) < MIN_CONTENT_CHARS:
+            return {"success": False, "friction": 1.5, "content": content, "status": "Too little static content."}
+
+        print(f"[INFO] Extracted {len(content)} chars of static content from {url}")
+        return {"success": True, "friction": 0.5, "content": content, "status": "Static HTML successfully scraped."}
+
     async def scrape(self, driver):
         """Public interface for AX to call."""
-        content, status = self.scrape_page(driver)
+        content, status = await run_blocking(self.scrape_page, driver)
         return {
             "success": True if content else False,
             "friction": 1,
@@ -0,0 +1,65 @@
+import importlib.util
+
+from bs4 import BeautifulSoup, NavigableString
+from bs4.element import PreformattedString
+
+# lxml is C-backed and several times faster than html.parser on large pages
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+BOILERPLATE_TAGS = {"script", "style", "noscript", "template", "svg", "iframe", "nav", "header", "footer", "aside", "form"}
+MIN_MAIN_CHARS = 200  # a <main>/<article> shorter than this is ignored in favour of <body>
+
+
+class HTMLDocument:
+    """A page parsed once and shared by text extraction, script scanning and form discovery.
+
+    The tree is never mutated, so the accessors can be called in any order.
+    """
+
+    def __init__(self, html):
+        self.html = html
+        self.soup = BeautifulSoup(html, HTML_PARSER)
+        self._text = None
+        self._main_text = None
+
+    def text(self):
+        """All text in the document, like soup.get_text()."""
+        if self._text is None:
+            self._text = self.soup.get_text()
+        return self._text
+
+    def main_text(self):
+        """Readable main content with navigation, scripts and other boilerplate skipped."""
+        if self._main_text is None:
+            root = self.soup.find("main") or self.soup.find(attrs={"role": "main"}) or self.soup.find("article")
+            text = _visible_text(root) if root is not None else ""
+            if len(text) < MIN_MAIN_CHARS:
+                text = _visible_text(self.soup.body or self.soup)
+            self._main_text = text
+        return self._main_text
+
+    def scripts(self):
+        """Inline script bodies."""
+        return [script.string for script in self.soup.find_all("script") if script.string]
+
+    def forms(self):
+        return self.soup.find_all("form")
+
+
+def _visible_text(root):
+    lines = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, NavigableString):
+            value = node.strip()
+            if value:
+                lines.append(value)
+            continue
+        for child in reversed(node.contents):
+            if isinstance(child, NavigableString):
+                if not isinstance(child, PreformattedString):
+                    stack.append(child)
+            elif child.name not in BOILERPLATE_TAGS:
+                stack.append(child)
+    return "\n".join(lines)
@@ -0,0 +1,83 @@
+import asyncio
+import importlib.util
+from urllib.parse import urlparse
+
+import httpx
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36"
+
+# HTTP/2 needs the h2 package; without it httpx falls back to HTTP/1.1
+HTTP2 = importlib.util.find_spec("h2") is not None
+DEFAULT_TIMEOUT = 10.0
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE = 40
+KEEPALIVE_EXPIRY = 30.0  # seconds an idle connection stays in the pool
+PER_HOST_REQUESTS = 6  # concurrent requests per host, like a browser
+
+
+class HTTPClient:
+    """The agent's one async HTTP client: pooled keep-alive connections, HTTP/2 and gzip/brotli.
+
+    Every non-browser fetch goes through it, so connection setup (DNS, TCP,
+    TLS) is paid once per host rather than once per request. httpx advertises
+    and decodes `br` whenever the brotli package is installed. Blocking code
+    (the browser threads) can use `get_sync`, which runs the request on the
+    client's own event loop.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, per_host=PER_HOST_REQUESTS, http2=HTTP2):
+        self.per_host = per_host
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            timeout=timeout,
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
+        self._host_slots = {}
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None  # bound on first async use
+
+    def _slot(self, url):
+        host = urlparse(url).netloc.lower()
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host)
+        return self._host_slots[host]
+
+    async def get(self, url, **kwargs):
+        """httpx `get` under the per-host limit; kwargs (timeout, headers, ...) pass through."""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        async with self._slot(url):
+            return await self.client.get(url, **kwargs)
+
+    def get_sync(self, url, timeout=DEFAULT_TIMEOUT, **kwargs):
+        """Blocking `get` for worker threads; must not be called from the client's own loop."""
+        if self._loop is None or not self._loop.is_running():
+            raise RuntimeError("HTTPClient.get_sync needs the client's event loop to be running")
+        future = asyncio.run_coroutine_threadsafe(self.get(url, timeout=timeout, **kwargs), self._loop)
+        return future.result(timeout + 1.0)
+
+    @property
+    def closed(self):
+        return self.client.is_closed
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+_shared_client = None
+
+
+def get_http_client():
+    """Process-wide client, created on first use."""
+    global _shared_client
+    if _shared_client is None or _shared_client.closed:
+        _shared_client = HTTPClient()
+    return _shared_client
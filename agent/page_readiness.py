@@ -0,0 +1,63 @@
+import time
+
+READY_TIMEOUT = 10.0  # upper bound (s) on waiting for a page to settle
+QUIET_PERIOD = 0.5  # network and DOM must be idle this long (s) to count as ready
+POLL_INTERVAL = 0.1
+
+# Installs a probe on first call (MutationObserver + fetch/XHR in-flight
+# counter) and reports how long the page has been quiet.
+_PROBE_SCRIPT = """
+var p = window.__axProbe;
+if (!p) {
+    p = window.__axProbe = {last: performance.now(), inflight: 0};
+    var touch = function () { p.last = performance.now(); };
+    new MutationObserver(touch).observe(document, {
+        subtree: true, childList: true, attributes: true, characterData: true
+    });
+    if (window.fetch) {
+        var origFetch = window.fetch;
+        window.fetch = function () {
+            p.inflight++; touch();
+            return origFetch.apply(this, arguments).finally(function () { p.inflight--; touch(); });
+        };
+    }
+    var origSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        p.inflight++; touch();
+        this.addEventListener('loadend', function () { p.inflight--; touch(); });
+        return origSend.apply(this, arguments);
+    };
+}
+var resources = performance.getEntriesByType('resource');
+var lastResource = resources.length ? resources[resources.length - 1].responseEnd : 0;
+return {
+    ready: document.readyState,
+    inflight: p.inflight,
+    idle: performance.now() - Math.max(p.last, lastResource)
+};
+"""
+
+
+def wait_for_page_ready(driver, timeout=READY_TIMEOUT, quiet_period=QUIET_PERIOD):
+    """Waits for load, network idle and DOM-mutation quiescence, capped at `timeout`.
+
+    Returns the number of seconds actually spent waiting.
+    """
+    start = time.monotonic()
+    quiet_ms = quiet_period * 1000
+
+    while True:
+        try:
+            state = driver.execute_script(_PROBE_SCRIPT)
+        except Exception as e:
+            print(f"[WARN] Readiness probe failed: {e}")
+            break
+
+        if state["ready"] == "complete" and state["inflight"] <= 0 and state["idle"] >= quiet_ms:
+            break
+        if time.monotonic() - start >= timeout:
+            print(f"[WARN] Page not quiet after {timeout}s — continuing anyway.")
+            break
+        time.sleep(POLL_INTERVAL)
+
+    return round(time.monotonic() - start, 2)
@@ -0,0 +1,81 @@
+import re
+from urllib.parse import urlparse
+
+BLOCKED_EXTENSIONS = {
+    "images": ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico", "bmp"),
+    "fonts": ("woff", "woff2", "ttf", "otf", "eot"),
+    "media": ("mp4", "webm", "mp3", "m4a", "m4s", "ogg", "wav", "m3u8", "mpd"),
+}
+TRACKER_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "adservice.google.*", "connect.facebook.net",
+    "amazon-adsystem.com", "scorecardresearch.com", "quantserve.com",
+    "hotjar.com", "chartbeat.com", "criteo.com", "taboola.com",
+    "outbrain.com", "segment.io", "nr-data.net", "adnxs.com",
+)
+
+
+def _extension_patterns(extensions):
+    # anchored to the end of the path (with or without a query) so hosts like www.webmd.com or www.gifts.com don't match
+    return [pattern for ext in extensions for pattern in (f"*://*/*.{ext}", f"*://*/*.{ext}?*")]
+
+
+def _host_patterns(domains):
+    return [pattern for domain in domains for pattern in (f"*://{domain}/*", f"*://*.{domain}/*")]
+
+
+# Chrome Network.setBlockedURLs wildcard patterns, by resource category.
+BLOCKED_PATTERNS = {
+    **{category: _extension_patterns(extensions) for category, extensions in BLOCKED_EXTENSIONS.items()},
+    "trackers": _host_patterns(TRACKER_DOMAINS),
+}
+
+
+def pattern_matches(pattern, url):
+    """Chrome's URL pattern semantics: `*` matches any run of characters, everything else is literal."""
+    return re.fullmatch(".*".join(map(re.escape, pattern.split("*"))), url) is not None
+
+
+# Sites that break without a category, e.g. {"images": ["example.com"]}.
+# A domain also matches its subdomains.
+DEFAULT_ALLOW = {}
+
+
+class RenderProfile:
+    """Headless launch flags plus per-site network blocking for text-only renders."""
+
+    def __init__(self, headless=True, block=tuple(BLOCKED_PATTERNS), allow=None):
+        self.headless = headless
+        self.block = list(block)
+        self.allow = DEFAULT_ALLOW if allow is None else allow
+
+    def apply_options(self, options):
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument("--window-size=1366,768")
+        if "media" in self.block:
+            options.add_argument("--mute-audio")
+            options.add_argument("--autoplay-policy=user-gesture-required")
+
+    def is_allowed(self, category, url):
+        host = urlparse(url).netloc.lower()
+        return any(host == domain or host.endswith("." + domain) for domain in self.allow.get(category, ()))
+
+    def blocked_patterns(self, url):
+        patterns = []
+        for category in self.block:
+            if not self.is_allowed(category, url):
+                patterns.extend(BLOCKED_PATTERNS[category])
+        # never block the page itself (e.g. a wiki "File:Logo.svg" page)
+        return [pattern for pattern in patterns if not pattern_matches(pattern, url)]
+
+    def apply_to_driver(self, driver, url):
+        """Installs the block list for `url` on the driver's current tab."""
+        patterns = self.blocked_patterns(url)
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        return patterns
+
+
+HEADLESS_TEXT_PROFILE = RenderProfile()
+HEADED_FULL_PROFILE = RenderProfile(headless=False, block=())
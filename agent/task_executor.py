@@ -1,53 +1,179 @@
 from agent.api_extractor import APIExtractor
 from agent.dom_scraper import DOMScraper
 from agent.browser_controller import BrowserController
-from utils.llm_categorizer import categorize_content
-from utils.llm_processor import process_web_content
+from agent.deadline import URL_DEADLINE, Deadline, adaptive_timeout
+from agent.http_client import get_http_client
+from ax.experience_logger import ExperienceLogger
+from utils.blocking import run_blocking
+from utils.llm_client import get_llm_client
 from urllib.parse import urlparse
+import asyncio
 import time
 import json
 
+HEDGE = True  # race the cheap methods instead of trying them one after another
+HEDGED_METHODS = ("api", "dom")
+HEDGE_DELAY = 1.5  # seconds before the next cheap method joins the race; 0 starts them together
+
 class TaskExecutor:
-    def __init__(self, memory):
-        self.api = APIExtractor()
-        self.dom = DOMScraper()
-        self.browser = BrowserController()
+    def __init__(self, memory, experience=None, hedge=HEDGE, hedge_delay=HEDGE_DELAY):
+        self.http = get_http_client()
+        self.api = APIExtractor(self.http)
+        self.dom = DOMScraper(self.http)
+        self.browser = BrowserController(http=self.http)
         self.memory = memory
+        self.experience = experience or ExperienceLogger()
+        self.llm = get_llm_client()
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+
+    def close(self):
+        self.browser.close()
+        self.experience.close()
+        self.llm.close()
+
+    async def aclose(self):
+        """Closes everything, including the shared HTTP client's pooled connections.
 
-    async def run(self, method: str, url: str, config: dict, tried=None) -> dict:
+        The blocking part runs off the loop so browser threads can still finish their requests.
+        """
+        await run_blocking(self.close)
+        await self.http.aclose()
+
+    async def run(self, method: str, url: str, config: dict, tried=None, deadline=None) -> dict:
+        """Runs `method`, then ranked fallbacks, all within one end-to-end `deadline` (URL_DEADLINE by default)."""
         print(f"[DEBUG] Starting execution using method: {method} for URL: {url}")
         if config is None:
             config = {}
         if tried is None:
             tried = set()
-        tried.add(method)
+        if deadline is None:
+            deadline = Deadline(URL_DEADLINE)
+
+        if self.hedge and method in HEDGED_METHODS:
+            cheap = [method] + [m for m in HEDGED_METHODS if m != method and m not in tried]
+            method, result, category = await self._run_hedged(cheap, url, config, tried, deadline)
+        else:
+            tried.add(method)
+            result = await self._attempt(method, url, config, deadline)
+            category = await self._record(url, method, config, result, deadline=deadline)
+
+        if not result["success"] and deadline.expired:
+            print(f"[WARN] Deadline for {url} exhausted; skipping fallbacks")
+        elif not result["success"]:
+            fallback_methods = self.get_ranked_fallbacks(url, category, tried)
+            for fallback in fallback_methods:
+                if fallback in tried:
+                    continue  # already run, e.g. as part of an earlier fallback's hedged race
+                print(f"[INFO] Trying fallback method: {fallback}")
+                alt_result = await self.run(fallback, url, config, tried, deadline)
+                if alt_result["success"]:
+                    return alt_result
+
+        result["final_method"] = method
+        print(f"[DEBUG] Final method used: {method}")
+        return result
+
+    async def _run_hedged(self, methods, url, config, tried, deadline):
+        """Races the cheap methods: the first starts now, each next one after `hedge_delay`
+        seconds (at once if the delay is 0, or as soon as everything running has failed).
+
+        The first success wins and the rest are cancelled. Returns (method, result, category)
+        for the winner, or for the last failure.
+        """
+        queue = list(methods)
+        running = {}  # task -> (method, started)
+        last = None
+
+        def launch():
+            hedge_method = queue.pop(0)
+            tried.add(hedge_method)
+            print(f"[INFO] Hedged attempt: {hedge_method}")
+            running[asyncio.ensure_future(self._attempt(hedge_method, url, config, deadline))] = (hedge_method, time.time())
+
+        launch()
+        while queue and self.hedge_delay <= 0:
+            launch()
+
+        winner = None
+        while running and winner is None:
+            done, _ = await asyncio.wait(running, timeout=self.hedge_delay if queue else None,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                launch()  # the leader is slow: hedge with the next method
+                continue
+            for task in done:
+                finished_method, _ = running.pop(task)
+                result = task.result()
+                if result["success"] and winner is None:
+                    winner = (finished_method, result)
+                else:
+                    category = await self._record(url, finished_method, config, result, analyze=False)
+                    last = (finished_method, result, category)
+            if winner is None and queue and not running:
+                launch()
+
+        for task, (cancelled_method, started) in running.items():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            print(f"[INFO] Cancelled hedged attempt: {cancelled_method}")
+            self.memory.breakers.release(urlparse(url.lower()).netloc, cancelled_method)
+            self.experience.log(
+                url, cancelled_method, False, round(time.time() - started, 2), 0.0,
+                status="cancelled",
+                method_source=config.get("method_source", "unknown"),
+                memory_hit=config.get("memory_hit", False),
+                hedged=True,
+            )
+
+        if winner is not None:
+            winner_method, result = winner
+            return winner_method, result, await self._record(url, winner_method, config, result, deadline=deadline)
+        return last
+
+    async def _attempt(self, method, url, config, deadline):
+        """Runs one extraction method and returns its result dict; never raises.
 
+        The attempt gets the domain's adaptive timeout for `method`, cut short by `deadline`.
+        """
         result = {"success": False, "data": None, "friction": 1.0, "time": 0.0}
+        domain = urlparse(url.lower()).netloc
+        if not self.memory.breakers.acquire(domain, method):
+            print(f"[INFO] Skipping {method} for {url}: circuit open")
+            result.update({"data": {"success": False, "status": "Circuit open"}, "friction": 0.0, "skipped": True})
+            return result
+
+        attempt_deadline = deadline.child(adaptive_timeout(self.memory, url, method))
+        result["timeout"] = attempt_deadline.budget
+        print(f"[DEBUG] {method} timeout for {url}: {attempt_deadline.budget}s")
         start_time = time.time()
 
         try:
             if method == "api":
-                result["data"] = await self.api.extract(url)
+                result["data"] = await asyncio.wait_for(
+                    self.api.extract(url, deadline=attempt_deadline), attempt_deadline.remaining())
                 result["success"] = result["data"] is not None
                 result["friction"] = 0.2 if result["success"] else 1.0
 
             elif method == "dom":
-                scraped_data = await self.dom.scrape(url)
-                if isinstance(scraped_data, str):
-                    result["data"] = scraped_data
-                    result["success"] = True
-                    result["friction"] = 0.5
-                else:
-                    result["data"] = None
-                    result["success"] = False
-                    result["friction"] = 1.5
+                scraped_data = await asyncio.wait_for(
+                    self.dom.fetch(url, deadline=attempt_deadline), attempt_deadline.remaining())
+                result["success"] = scraped_data["success"]
+                result["data"] = scraped_data  # kept on failure too, for its status
+                result["friction"] = scraped_data["friction"]
 
             elif method == "browser":
-                result["data"] = await self.browser.open(url, fill_forms=config.get("fill_forms", False))
+                result["data"] = await asyncio.wait_for(
+                    self.browser.open(url, fill_forms=config.get("fill_forms", False), deadline=attempt_deadline),
+                    attempt_deadline.remaining())
                 print(f"[INFO] Browser scraping completed and content processed.")
                 if isinstance(result["data"], dict):
                     result["success"] = result["data"].get("success", False)
                     result["form_detected"] = result["data"].get("form_detected", False)
+                    result["ready_wait"] = result["data"].get("ready_wait")
                 else:
                     print("[WARN] result['data'] was None or not a dict — defaulting to failure.")
                     result["success"] = False
@@ -56,6 +182,12 @@ class TaskExecutor:
 
                 result["friction"] = 1.0 if result["success"] else 2.0
 
+        except asyncio.TimeoutError:
+            print(f"[ERROR] Method {method} timed out on {url} after {attempt_deadline.budget}s")
+            result["success"] = False
+            result["data"] = {"success": False, "status": f"Timed out after {attempt_deadline.budget}s"}
+            result["friction"] = 2.0
+
         except Exception as e:
             print(f"[ERROR] Method {method} failed on {url}: {str(e)}")
             result["success"] = False
@@ -68,21 +200,33 @@ class TaskExecutor:
 
         end_time = time.time()
         result["time"] = round(end_time - start_time, 2)
+        return result
+
+    async def _record(self, url, method, config, result, analyze=True, deadline=None):
+        """Categorizes/summarizes a success, then logs the attempt to memory and the experience log.
 
+        Returns the content category, or None when it was not analysed. Attempts skipped by
+        an open circuit only go to the experience log, so they do not count as failures.
+        """
         category = None
-        strategy_from = "new"
-        if result["success"] and result["data"]:
-            try:
-                data_str = result["data"]
-                if isinstance(data_str, dict):
-                    data_str = json.dumps(data_str)
+        if result.get("skipped"):
+            self.experience.log(
+                url, method, False, 0.0, 0.0,
+                status="circuit_open",
+                method_source=config.get("method_source", "unknown"),
+                memory_hit=config.get("memory_hit", False),
+            )
+            return category
 
-                category = categorize_content(data_str)
+        if analyze and result["success"] and result["data"]:
+            try:
+                print("[INFO] Categorizing and summarizing content via LLM...")
+                llm_deadline = deadline.remaining(cap=self.llm.deadline, floor=1.0) if deadline else None
+                analysis = await self.llm.analyze(self._analysis_text(method, result["data"]), deadline=llm_deadline)
+                category = analysis["category"]
+                result["degraded"] = analysis["degraded"]
                 print(f"[DEBUG] Content categorized as: {category}")
-
-                print("[INFO] Summarizing content via LLM...")
-                summary = process_web_content(data_str)
-                print(f"[SUMMARY]\n{summary}\n")
+                print(f"[SUMMARY]\n{analysis['summary']}\n")
 
             except Exception as e:
                 print(f"[WARN] Categorization or summary failed: {e}")
@@ -98,27 +242,41 @@ class TaskExecutor:
             "method_source": config.get("method_source", "unknown"),
             "memory_hit": config.get("memory_hit", False),
             "form_detected": result.get("form_detected", False),
+            "ready_wait": result.get("ready_wait"),
+            "degraded": result.get("degraded", False),
             "has_form_expected": config.get("has_form_expected", False),
             "true_category": config.get("true_category"),
             "expected_method": config.get("expected_method")
         })
 
+        # Every attempt, including failures that memory.log only counts, goes to the experience log
+        self.experience.log(
+            url, method, result["success"], result["time"], result["friction"],
+            category=category,
+            status=result["data"].get("status"),
+            method_source=config.get("method_source", "unknown"),
+            memory_hit=config.get("memory_hit", False),
+            ready_wait=result.get("ready_wait"),
+            degraded=result.get("degraded", False),
+            timeout=result.get("timeout"),
+        )
 
-        if not result["success"]:
-            fallback_methods = self.get_ranked_fallbacks(url, category, tried)
-            for fallback in fallback_methods:
-                print(f"[INFO] Trying fallback method: {fallback}")
-                alt_result = await self.run(fallback, url, config, tried)
-                if alt_result["success"]:
-                    return alt_result
+        return category
 
-        result["final_method"] = method
-        print(f"[DEBUG] Final method used: {method}")
-        return result
+    @staticmethod
+    def _analysis_text(method, data):
+        """What the LLM sees: the page text for dom/browser results, the JSON payload for api ones."""
+        if method in ("dom", "browser") and isinstance(data, dict):
+            return data.get("content") or ""
+        # sorted keys: the cache key must depend on the payload, not on the order the API sent it in
+        return data if isinstance(data, str) else json.dumps(data, sort_keys=True)
 
     def get_ranked_fallbacks(self, url, category, tried):
         methods = ["api", "dom", "browser"]
         if category:
             stats = self.memory.get_category_stats(category)
-            return [m for m in sorted(stats, key=lambda m: (stats[m].get("friction", 2.0), -stats[m].get("success_rate", 0))) if m not in tried]
-        return [m for m in methods if m not in tried]
+            ranked = sorted(stats, key=lambda m: (stats[m].get("friction", 2.0), -stats[m].get("success_rate", 0)))
+            # Methods never tried in this category keep their default order at the end
+            methods = [m for m in ranked if m in methods] + [m for m in methods if m not in stats]
+        domain = urlparse(url.lower()).netloc
+        return [m for m in methods if m not in tried and self.memory.breakers.available(domain, m)]
@@ -1,67 +1,185 @@
-import json
+import argparse
+import threading
+import time
 from pathlib import Path
 from urllib.parse import urlparse
 from datetime import datetime  # Add this to top if not present
 
+from ax.circuit_breaker import CircuitBreakers
+from ax.memory_store import open_store
+from ax.method_stats import MethodStats
+
+RECENT_RESULTS = 20  # raw results kept per (category, domain, method); older ones live on in the counters
+STATS_HALF_LIFE_DAYS = 30  # aggregated stats lose half their weight over this many days
+MIN_STATS_WEIGHT = 0.05  # compaction drops counters that have decayed below this many results
+
+# Public suffixes with a second level, so "bbc.co.uk" stays whole instead of collapsing to "co.uk"
+SECOND_LEVEL_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "com.au", "net.au", "org.au", "edu.au", "gov.au",
+    "co.nz", "co.jp", "co.in", "com.br", "com.cn", "com.sg", "co.za", "com.mx",
+}
+
+
+def registrable_domain(host):
+    """'news.bbc.co.uk' -> 'bbc.co.uk', 'www.indeed.com' -> 'indeed.com'."""
+    labels = host.split(":")[0].strip(".").split(".")
+    keep = 3 if ".".join(labels[-2:]) in SECOND_LEVEL_SUFFIXES else 2
+    return ".".join(labels[-keep:])
+
+
 class AXMemory:
-    def __init__(self, filepath='ax_memory.json'):
+    def __init__(self, filepath='ax_memory.json', legacy_json='ax_memory.json',
+                 max_recent=RECENT_RESULTS, half_life_days=STATS_HALF_LIFE_DAYS):
+        """`filepath` ending in .db/.sqlite uses the SQLite engine; `legacy_json` is migrated into it once.
+
+        Raw history is a ring of `max_recent` results per domain/method; older
+        runs only survive in counters that decay with `half_life_days`.
+        """
         self.filepath = Path(filepath)
-        if self.filepath.exists():
-            with self.filepath.open() as f:
-                self.data = json.load(f)
-        else:
-            self.data = {"urls": {}, "categories": {}}
-        self.url_log = self.data["urls"]
+        self.half_life = half_life_days * 86400 if half_life_days else None
+        legacy = legacy_json if Path(legacy_json) != self.filepath else None
+        self.store = open_store(self.filepath, legacy_json=legacy, max_recent=max_recent)
+        # guards _stats and the domain indexes: the policy reads them from worker threads while log() writes
+        self._lock = threading.RLock()
+
+        # domain -> category and registrable domain -> category, kept current by log()
+        self._domain_index = {}
+        self._registrable_index = {}
+        for domain, category in self.store.domain_categories():
+            self._index_domain(domain, category)
+
+        # Aggregated per-(category, method) and per-(domain, method) counters
+        self._stats = {"category": {}, "domain": {}}
+        for scope, key, method, counters in self.store.load_method_stats():
+            self._stats[scope].setdefault(key, {})[method] = MethodStats.from_dict(counters, half_life=self.half_life)
+        if not self.store.get_meta("method_stats_built"):
+            self._rebuild_stats()
+
+        # (domain, method) circuit breakers, fed by log()
+        self.breakers = CircuitBreakers(self.store)
+
+    def _rebuild_stats(self):
+        """One-time pass over stored history for memories written before counters existed."""
+        self._stats = {"category": {}, "domain": {}}
+        for category, domains in self.store.categories().items():
+            for domain, methods in domains.items():
+                for method, results in methods.items():
+                    for result in results:
+                        self._update_stats(category, domain, method, result, persist=False,
+                                           now=_timestamp(result.get("timestamp")))
+        for scope, keys in self._stats.items():
+            for key, methods in keys.items():
+                for method, stats in methods.items():
+                    self.store.save_method_stats(scope, key, method, stats.to_dict(), flush=False)
+        self.store.set_meta("method_stats_built", True)
+        self.store.flush()
+
+    def _update_stats(self, category, domain, method, result, persist=True, flush=False, now=None):
+        for scope, key in (("category", category), ("domain", domain)):
+            if not key:
+                continue
+            methods = self._stats[scope].setdefault(key, {})
+            if method not in methods:
+                methods[method] = MethodStats(updated_at=now, half_life=self.half_life)
+            stats = methods[method]
+            stats.add(result, now=now)
+            if persist:
+                self.store.save_method_stats(scope, key, method, stats.to_dict(), flush=flush)
+
+    def _index_domain(self, domain, category):
+        self._domain_index.setdefault(domain, category)
+        self._registrable_index.setdefault(registrable_domain(domain), category)
+
+    def close(self):
+        self.store.close()
 
     def get(self, url):
-        return self.url_log.get(url.lower(), {})
+        return self.store.get_url(url.lower())
 
     def get_category_by_domain(self, url):
+        """O(1) lookup by exact host, then by registrable domain (subdomains share a category)."""
         if "://" not in url:
             domain = url.lower()  # already a domain
-            print(f"[DEBUG] (domain input) Using raw domain input: '{domain}'")
         else:
             domain = urlparse(url.lower()).netloc
-            print(f"[DEBUG] (url input) Extracted domain '{domain}' from full URL '{url}'")
-        for category, domains in self.data["categories"].items():
-            for known_domain in domains:
-                if domain == known_domain:
-                    return category
-        return None
+        with self._lock:
+            category = self._domain_index.get(domain)
+            if category is None and domain:
+                category = self._registrable_index.get(registrable_domain(domain))
+        return category
 
     def get_categories(self):
-        return self.data["categories"]
+        return self.store.categories()
 
     def get_domain_list_for_category(self, category):
-        return list(self.data["categories"].get(category, {}).keys())
+        return list(self.store.category_tree(category).keys())
+
+    def _current_stats(self, scope, key):
+        """Decayed counters for `key`; callers hold `_lock` while using them."""
+        methods = self._stats[scope].get(key, {})
+        now = time.time()
+        for stats in methods.values():
+            stats.decay(now)
+        return methods
 
     def get_best_method_for_category(self, category):
-        stats = self.data["categories"].get(category, {})
-        if not stats:
-            return None
-        methods = {}
-        for domain_stats in stats.values():
-            for method, results in domain_stats.items():
-                if method not in methods:
-                    methods[method] = {"success": 0, "total": 0}
-                methods[method]["success"] += sum(1 for r in results if r["success"])
-                methods[method]["total"] += len(results)
-        if not methods:
-            return None
-        return max(methods.items(), key=lambda x: x[1]["success"] / x[1]["total"])[0]
+        with self._lock:
+            methods = self._current_stats("category", category)
+            if not methods:
+                return None
+            return max(methods.items(), key=lambda x: (x[1].smoothed_success_rate, -x[1].mean_time))[0]
 
     def get_category_stats(self, category: str):
-        return self.data["categories"].get(category, {})
+        """Per-method summary for a category: success_rate, friction, mean_time, time_std, total."""
+        with self._lock:
+            return {method: stats.summary() for method, stats in self._current_stats("category", category).items()}
 
-    
+    def get_domain_stats(self, domain: str):
+        """Per-method summary for a single domain, same shape as get_category_stats."""
+        with self._lock:
+            return {method: stats.summary() for method, stats in self._current_stats("domain", domain.lower()).items()}
 
-    def log(self, url, method, result):
-        if not result.get("success"):
-            return  # Only log successful runs
+    def get_recent_times(self, domain: str, method: str):
+        """Wall times of the domain's recent successful runs with `method`, oldest first."""
+        results = self.store.recent_results(domain.lower(), method, RECENT_RESULTS)
+        return [r.get("time") for r in results if r.get("success")]
+
+    def compact(self):
+        """Trims raw history to the retention ring and drops fully decayed counters."""
+        now = time.time()
+        dropped = 0
+        with self._lock:
+            for scope, keys in self._stats.items():
+                for key in list(keys):
+                    for method in list(keys[key]):
+                        stats = keys[key][method]
+                        stats.decay(now)
+                        if stats.total < MIN_STATS_WEIGHT:
+                            del keys[key][method]
+                            self.store.delete_method_stats(scope, key, method)
+                            dropped += 1
+                        else:
+                            self.store.save_method_stats(scope, key, method, stats.to_dict(), flush=False)
+                    if not keys[key]:
+                        del keys[key]
+        pruned = self.breakers.prune(now)
+        removed = self.store.compact()
+        print(f"[INFO] Compacted memory: removed {removed} old result(s), dropped {dropped} stale counter(s) "
+              f"and {pruned} stale circuit breaker(s)")
+        return removed, dropped
 
+    def log(self, url, method, result):
         url = url.lower()
         domain = urlparse(url).netloc
 
+        self.breakers.record(domain, method, bool(result.get("success")))
+
+        if not result.get("success"):
+            # Failures only feed the counters and breakers; raw history keeps successful runs
+            with self._lock:
+                self._update_stats(self.get_category_by_domain(domain), domain, method, result, flush=True)
+            return
+
         # Use provided category or infer
         category = result.get("category") or self.get_category_by_domain(url) or "uncategorized"
         result["category"] = category  # Ensure category is saved in the result
@@ -71,14 +189,26 @@ class AXMemory:
         result["method_source"] = result.get("method_source", "policy")
         result["timestamp"] = datetime.utcnow().isoformat()
 
-        # Log under URL index
-        self.data["urls"][url] = {
-            "method": method,
-            "result": result
-        }
+        # Log under URL index and category-method-domain index
+        with self._lock:
+            self._update_stats(category, domain, method, result)
+            self.store.append(url, domain, category, method, result)
+            self._index_domain(domain, category)
+
+
+def _timestamp(value):
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
 
-        # Log under category-method-domain index
-        self.data["categories"].setdefault(category, {}).setdefault(domain, {}).setdefault(method, []).append(result)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AX memory maintenance")
+    parser.add_argument("command", choices=["compact"])
+    parser.add_argument("path", nargs="?", default="ax_memory.db")
+    args = parser.parse_args()
 
-        with self.filepath.open("w") as f:
-            json.dump(self.data, f, indent=2)
+    memory = AXMemory(args.path)
+    memory.compact()
+    memory.close()
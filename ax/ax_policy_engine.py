@@ -1,41 +1,46 @@
 import re
 from urllib.parse import urlparse
+from ax.bandit import EXPLORATION_BUDGET, UCBPolicy
 from utils.llm_categorizer import categorize_content
 
 class AXPolicyEngine:
-    def __init__(self, memory):
+    def __init__(self, memory, exploration_budget=EXPLORATION_BUDGET, bandit=None):
         self.memory = memory
+        self.bandit = bandit or UCBPolicy(exploration_budget=exploration_budget)
 
     def decide(self, url: str, config: dict) -> tuple[str, str]:
+        """(method, source); source is "domain", "llm", "explore" or "policy" (no evidence yet)."""
         print(f"[DEBUG] 🔍 Entering AXPolicyEngine.decide for URL: {url}")
 
-        # STEP 1: Exact URL match
-        if url.lower() in self.memory.url_log:
-            method = self.memory.url_log[url.lower()]["method"]
-            print(f"[DEBUG] ✅ Step 1 - Exact URL match found: {method}")
-            return method, "url"
-
         # Extract domain
-        domain = urlparse(url).netloc
+        domain = urlparse(url).netloc.lower()
         print(f"[DEBUG] 🌐 Extracted domain: {domain}")
+        domain_stats = self.memory.get_domain_stats(domain)
 
-        # STEP 2: Check for domain match
+        # STEP 1: Category from a known domain, inferred only for domains with no history
         category = self.memory.get_category_by_domain(domain)
-        if category:
-            best_method = self.memory.get_best_method_for_category(category)
-            print(f"[DEBUG] ✅ Step 2 - Domain match: category='{category}', method='{best_method}'")
-            if best_method:
-                return best_method, "domain"
-
-        # STEP 3: Use LLM to infer similar category based on domain
-        print(f"[DEBUG] 🤖 Step 3 - No exact domain match. Attempting LLM similarity on domain")
-        html = f"<html><body>{domain}</body></html>"
-        category = categorize_content(html)
-        best_method = self.memory.get_best_method_for_category(category)
-        if best_method:
-            print(f"[DEBUG] ✅ Step 3 - LLM-inferred category='{category}', method='{best_method}'")
-            return best_method, "llm"
+        category_source = "domain"
+        if not category and not domain_stats:
+            print("[DEBUG] 🤖 Step 1 - Unknown domain. Inferring category from the domain name")
+            html = f"<html><body>{domain}</body></html>"
+            category = categorize_content(html)
+            category_source = "llm"
+        print(f"[DEBUG] ✅ Step 1 - category='{category}' (from {category_source})")
 
-        # STEP 4: No match found, full pipeline fallback
-        print(f"[DEBUG] ❌ Step 4 - No prior memory match. Proceed with full pipeline")
-        return "pipeline", "policy"
\ No newline at end of file
+        # STEP 2: UCB over methods whose circuit is not open: domain history, with the category's as prior
+        category_stats = self.memory.get_category_stats(category) if category else {}
+        allowed = [m for m in self.bandit.methods if self.memory.breakers.available(domain, m)]
+        if len(allowed) < len(self.bandit.methods):
+            print(f"[DEBUG] ⛔ Step 2 - Open circuits on {domain}; choosing among {allowed or 'all methods'}")
+        method, explored, arms = self.bandit.select(domain_stats, category_stats, methods=allowed)
+        if explored:
+            source = "explore"
+        elif domain_stats:
+            source = "domain"
+        elif category_stats:
+            source = category_source
+        else:
+            source = "policy"
+        estimates = {m: f"{a['success_rate']:.2f}@{a['mean_time']:.1f}s/n={a['total']:.1f}" for m, a in arms.items()}
+        print(f"[DEBUG] ✅ Step 2 - Bandit chose '{method}' ({source}); estimates: {estimates}")
+        return method, source
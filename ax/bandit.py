@@ -0,0 +1,101 @@
+import math
+import threading
+
+METHODS = ("api", "dom", "browser")  # cheapest first; the order breaks ties between unseen methods
+UCB_C = 1.0  # width of the confidence bonus
+EXPLORATION_BUDGET = 0.2  # at most this share of decisions may overrule the greedy choice
+TIME_SCALE = 10.0  # a success taking this many seconds is worth half an instant one
+FRICTION_WEIGHT = 0.25
+PRIOR_WEIGHT = 3.0  # category history counts as at most this many results for a domain
+
+
+def reward(success, time_taken, friction, time_scale=TIME_SCALE, friction_weight=FRICTION_WEIGHT):
+    """Reward in [0, 1] for one attempt: 0 on failure, shrinking with wall time and friction on success."""
+    if not success:
+        return 0.0
+    return 1.0 / (1.0 + (time_taken or 0.0) / time_scale) / (1.0 + friction_weight * (friction or 0.0))
+
+
+def blend(domain_summary, category_summary, prior_weight=PRIOR_WEIGHT):
+    """Domain evidence plus the category's, scaled down to `prior_weight` pseudo-results.
+
+    Both arguments are `MethodStats.summary()` dicts (or None).
+    """
+    total = successes = time_sum = friction_sum = 0.0
+    for summary, scale in ((domain_summary, 1.0), (category_summary, None)):
+        if not summary or not summary["total"]:
+            continue
+        if scale is None:
+            scale = min(1.0, prior_weight / summary["total"])
+        weight = summary["total"] * scale
+        total += weight
+        successes += summary["success_rate"] * weight
+        time_sum += summary["mean_time"] * weight
+        friction_sum += summary["friction"] * weight
+    if not total:
+        return {"total": 0.0, "success_rate": 0.0, "mean_time": 0.0, "friction": 0.0}
+    return {
+        "total": total,
+        "success_rate": successes / total,
+        "mean_time": time_sum / total,
+        "friction": friction_sum / total,
+    }
+
+
+class UCBPolicy:
+    """UCB1 over extraction methods, scored by expected reward rather than raw success.
+
+    A method's value is its success rate discounted by its mean wall time and
+    friction (see `reward`), so a slow browser success no longer beats a fast
+    DOM fetch. The optimistic bonus shrinks as a method gathers evidence; a
+    method never tried on a domain or its category is always worth a look,
+    but only within `exploration_budget` of all decisions.
+    """
+
+    def __init__(self, methods=METHODS, exploration_budget=EXPLORATION_BUDGET, c=UCB_C,
+                 time_scale=TIME_SCALE, friction_weight=FRICTION_WEIGHT, prior_weight=PRIOR_WEIGHT):
+        self.methods = list(methods)
+        self.exploration_budget = exploration_budget
+        self.c = c
+        self.time_scale = time_scale
+        self.friction_weight = friction_weight
+        self.prior_weight = prior_weight
+        self.decisions = 0
+        self.explorations = 0
+        self._lock = threading.Lock()
+
+    def _value(self, arm, success_rate):
+        discount = reward(True, arm["mean_time"], arm["friction"], self.time_scale, self.friction_weight)
+        return success_rate * discount
+
+    def select(self, domain_stats, category_stats, methods=None):
+        """(method, explored, evidence) where evidence is the blended per-method estimate.
+
+        `methods` restricts the choice (e.g. to methods whose circuit is not open).
+        """
+        candidates = [m for m in self.methods if methods is None or m in methods] or self.methods
+        arms = {m: blend(domain_stats.get(m), category_stats.get(m), self.prior_weight) for m in candidates}
+        pulls = sum(arm["total"] for arm in arms.values())
+
+        def optimistic(method):
+            arm = arms[method]
+            if not arm["total"]:
+                return math.inf
+            bonus = self.c * math.sqrt(2 * math.log(pulls + 1) / arm["total"])
+            return self._value(arm, min(1.0, arm["success_rate"] + bonus))
+
+        seen = [m for m in candidates if arms[m]["total"]]
+        greedy = max(seen, key=lambda m: self._value(arms[m], arms[m]["success_rate"])) if seen else None
+        candidate = max(candidates, key=optimistic)
+
+        with self._lock:
+            self.decisions += 1
+            if greedy is None:
+                return candidate, False, arms  # nothing to exploit yet
+            explored = candidate != greedy and self.explorations < self.exploration_budget * self.decisions
+            if explored:
+                self.explorations += 1
+        return (candidate if explored else greedy), explored, arms
+
+    def stats(self):
+        return {"decisions": self.decisions, "explorations": self.explorations}
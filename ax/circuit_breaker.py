@@ -0,0 +1,126 @@
+import threading
+import time
+
+FAILURE_THRESHOLD = 3  # consecutive failures that open a breaker
+COOL_DOWN = 30 * 60  # seconds an open breaker skips its method before a probe is allowed
+STALE_AFTER = 24 * 3600  # a breaker untouched this long is forgotten, and its failures with it
+LEGACY_META_KEY = "circuit_breakers"  # older memories kept every breaker in one meta row
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreakers:
+    """Failure-aware breakers keyed by (domain, method), one store row each.
+
+    A breaker opens after `threshold` consecutive failures and the method is
+    skipped for `cool_down` seconds. It then goes half-open: exactly one
+    attempt is let through as a probe; success closes the breaker, failure
+    re-opens it for another cool-down. Only breakers with failures are
+    stored; a success deletes the row, and rows untouched for `stale_after`
+    seconds are pruned.
+    """
+
+    def __init__(self, store, threshold=FAILURE_THRESHOLD, cool_down=COOL_DOWN, stale_after=STALE_AFTER):
+        self.store = store
+        self.threshold = threshold
+        self.cool_down = cool_down
+        self.stale_after = stale_after
+        self._lock = threading.Lock()
+        self._probes = {}  # (domain, method) -> probe start; in-process only
+        # (domain, method) -> {"failures": n, "state": ..., "opened_at": ts, "updated_at": ts}
+        self._breakers = {(domain, method): entry for domain, method, entry in store.load_breakers()}
+        self._migrate_legacy()
+        self.prune()
+
+    def _migrate_legacy(self):
+        legacy = self.store.get_meta(LEGACY_META_KEY)
+        if not legacy:
+            return
+        for domain, methods in legacy.items():
+            for method, entry in methods.items():
+                entry.setdefault("updated_at", entry.get("opened_at") or time.time())
+                self._breakers[(domain, method)] = entry
+                self.store.save_breaker(domain, method, entry)
+        self.store.set_meta(LEGACY_META_KEY, None)
+
+    def _stale(self, entry, now):
+        return now - (entry.get("updated_at") or 0) >= self.stale_after
+
+    def prune(self, now=None):
+        """Deletes breakers untouched for `stale_after` seconds; returns how many."""
+        now = now or time.time()
+        with self._lock:
+            stale = [key for key, entry in self._breakers.items() if self._stale(entry, now)]
+            for domain, method in stale:
+                del self._breakers[(domain, method)]
+                self.store.delete_breaker(domain, method)
+        return len(stale)
+
+    def state(self, domain, method, now=None):
+        now = now or time.time()
+        entry = self._breakers.get((domain, method))
+        if entry is None or self._stale(entry, now):
+            return CLOSED
+        if entry["state"] == OPEN and now - entry["opened_at"] >= self.cool_down:
+            return HALF_OPEN
+        return entry["state"]
+
+    def available(self, domain, method, now=None):
+        """True if an attempt would be let through right now; does not claim the probe."""
+        with self._lock:
+            return self._available(domain, method, now or time.time())
+
+    def acquire(self, domain, method, now=None):
+        """Like `available`, but a half-open breaker hands its single probe to this caller."""
+        now = now or time.time()
+        with self._lock:
+            if not self._available(domain, method, now):
+                return False
+            if self.state(domain, method, now) == HALF_OPEN:
+                self._probes[(domain, method)] = now
+                print(f"[INFO] Circuit half-open for {method} on {domain}; probing")
+            return True
+
+    def release(self, domain, method):
+        """Gives back an unused probe (e.g. the attempt was cancelled before it finished)."""
+        with self._lock:
+            self._probes.pop((domain, method), None)
+
+    def record(self, domain, method, success, now=None):
+        now = now or time.time()
+        with self._lock:
+            self._probes.pop((domain, method), None)
+            key = (domain, method)
+            if success:
+                entry = self._breakers.pop(key, None)
+                if entry is None:
+                    return  # already closed, nothing to persist
+                self.store.delete_breaker(domain, method)
+                if entry["state"] == OPEN:
+                    print(f"[INFO] Circuit closed for {method} on {domain}")
+                return
+
+            state = self.state(domain, method, now)
+            entry = self._breakers.get(key)
+            if entry is None or self._stale(entry, now):
+                entry = self._breakers[key] = {"failures": 0, "state": CLOSED, "opened_at": None}
+            entry["failures"] += 1
+            entry["updated_at"] = now
+            if state == HALF_OPEN or entry["failures"] >= self.threshold:
+                entry["state"] = OPEN
+                entry["opened_at"] = now
+                print(f"[WARN] Circuit open for {method} on {domain} after {entry['failures']} failure(s); "
+                      f"skipping it for {self.cool_down}s")
+            self.store.save_breaker(domain, method, entry)
+
+    def _available(self, domain, method, now):
+        state = self.state(domain, method, now)
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+        probe = self._probes.get((domain, method))
+        # a probe that never reported back (crash, lost task) is given up after one cool-down
+        return probe is None or now - probe >= self.cool_down
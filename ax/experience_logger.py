@@ -1,13 +1,43 @@
+import atexit
 import json
 import os
+import threading
 from datetime import datetime
 
+try:
+    import fcntl  # POSIX only; used to serialise appends across processes
+except ImportError:
+    fcntl = None
+
+
 class ExperienceLogger:
-    def __init__(self, log_path="experience_log.json"):
-        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    """Append-only JSON-lines log of every attempt, written through a buffer.
+
+    Records are flushed when `flush_size` are pending or every
+    `flush_interval` seconds, and fsynced on close/exit. Each flush is a
+    single O_APPEND write under an exclusive lock file, so several worker
+    processes can share one log. The file rotates to `.1 … .N` past `max_bytes`.
+    """
+
+    def __init__(self, log_path="experience_log.jsonl", flush_size=50, flush_interval=2.0,
+                 max_bytes=10 * 1024 * 1024, backups=5):
+        directory = os.path.dirname(log_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
         self.log_path = log_path
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
 
-    def log(self, url, method, success, time_taken, friction):
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="experience-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def log(self, url, method, success, time_taken, friction, **extra):
         record = {
             "timestamp": datetime.now().isoformat(),
             "url": url,
@@ -16,15 +46,88 @@ class ExperienceLogger:
             "time_taken": time_taken,
             "friction": friction,
         }
+        record.update(extra)
 
-        if not os.path.exists(self.log_path):
-            with open(self.log_path, "w") as f:
-                json.dump([record], f, indent=2)
-        else:
-            with open(self.log_path, "r+") as f:
-                data = json.load(f)
-                data.append(record)
-                f.seek(0)
-                json.dump(data, f, indent=2)
+        with self._lock:
+            self._buffer.append(json.dumps(record, default=str) + "\n")
+            if len(self._buffer) >= self.flush_size:
+                self._flush_locked()
 
         print(f"[LOG] {method.upper()} - Success: {success}, Time: {time_taken}s, Friction: {friction}")
+
+    def flush(self, fsync=False):
+        with self._lock:
+            self._flush_locked(fsync)
+
+    def close(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._flusher.join()
+        self.flush(fsync=True)
+        atexit.unregister(self.close)
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"[WARN] Experience log flush failed: {e}")
+
+    def _flush_locked(self, fsync=False):
+        if not self._buffer:
+            return
+        data = "".join(self._buffer).encode("utf-8")
+        self._buffer = []
+
+        with open(self.log_path + ".lock", "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._rotate_if_needed(len(data))
+                fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, data)
+                    if fsync:
+                        os.fsync(fd)
+                finally:
+                    os.close(fd)
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _rotate_if_needed(self, incoming):
+        try:
+            size = os.path.getsize(self.log_path)
+        except OSError:
+            return
+        if size == 0 or size + incoming <= self.max_bytes:
+            return
+        for index in range(self.backups - 1, 0, -1):
+            src = f"{self.log_path}.{index}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.log_path}.{index + 1}")
+        os.replace(self.log_path, f"{self.log_path}.1")
+
+
+def iter_experiences(log_path="experience_log.jsonl", include_rotated=True):
+    """Streams records oldest first, one line at a time, without loading the whole log."""
+    paths = []
+    if include_rotated:
+        index = 1
+        while os.path.exists(f"{log_path}.{index}"):
+            paths.insert(0, f"{log_path}.{index}")
+            index += 1
+    if os.path.exists(log_path):
+        paths.append(log_path)
+
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # torn line from a crashed writer
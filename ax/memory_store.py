@@ -0,0 +1,385 @@
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from ax.method_stats import MethodStats
+
+
+class JSONMemoryStore:
+    """The original storage: one JSON document rewritten on every write."""
+
+    def __init__(self, filepath, max_recent=None):
+        self.filepath = Path(filepath)
+        self.max_recent = max_recent
+        if self.filepath.exists():
+            with self.filepath.open() as f:
+                self.data = json.load(f)
+        else:
+            self.data = {"urls": {}, "categories": {}}
+
+    def get_url(self, url):
+        return self.data["urls"].get(url, {})
+
+    def urls(self):
+        """(url, {"method", "result"}) for every URL with a stored result."""
+        yield from self.data["urls"].items()
+
+    def categories(self):
+        return self.data["categories"]
+
+    def category_tree(self, category):
+        return self.data["categories"].get(category, {})
+
+    def domain_categories(self):
+        """(domain, category) pairs, a domain's first category first."""
+        for category, domains in self.data["categories"].items():
+            for domain in domains:
+                yield domain, category
+
+    def recent_results(self, domain, method, limit):
+        """Newest-last raw results for one (domain, method), across categories."""
+        results = []
+        for domains in self.data["categories"].values():
+            results.extend(domains.get(domain, {}).get(method, []))
+        return results[-limit:]
+
+    def append(self, url, domain, category, method, result):
+        self.data["urls"][url] = {"method": method, "result": result}
+        results = self.data["categories"].setdefault(category, {}).setdefault(domain, {}).setdefault(method, [])
+        results.append(result)
+        if self.max_recent:
+            del results[:-self.max_recent]
+        self.flush()
+
+    def load_method_stats(self):
+        """(scope, key, method, counters) rows; scope is "category" or "domain"."""
+        for scope, keys in self.data.get("stats", {}).items():
+            for key, methods in keys.items():
+                for method, counters in methods.items():
+                    yield scope, key, method, counters
+
+    def save_method_stats(self, scope, key, method, counters, flush=True):
+        self.data.setdefault("stats", {}).setdefault(scope, {}).setdefault(key, {})[method] = counters
+        if flush:
+            self.flush()
+
+    def delete_method_stats(self, scope, key, method):
+        methods = self.data.get("stats", {}).get(scope, {}).get(key, {})
+        methods.pop(method, None)
+        if not methods:
+            self.data.get("stats", {}).get(scope, {}).pop(key, None)
+
+    def compact(self):
+        """Trims every raw result list to the retention ring and rewrites the file."""
+        removed = 0
+        if self.max_recent:
+            for domains in self.data["categories"].values():
+                for methods in domains.values():
+                    for results in methods.values():
+                        removed += max(len(results) - self.max_recent, 0)
+                        del results[:-self.max_recent]
+        self.flush()
+        return removed
+
+    def load_breakers(self):
+        """(domain, method, entry) for every circuit breaker that is not plainly closed."""
+        for domain, methods in self.data.get("breakers", {}).items():
+            for method, entry in methods.items():
+                yield domain, method, entry
+
+    def save_breaker(self, domain, method, entry):
+        self.data.setdefault("breakers", {}).setdefault(domain, {})[method] = entry
+        self.flush()
+
+    def delete_breaker(self, domain, method):
+        methods = self.data.get("breakers", {}).get(domain, {})
+        if methods.pop(method, None) is None:
+            return
+        if not methods:
+            self.data["breakers"].pop(domain, None)
+        self.flush()
+
+    def get_meta(self, key, default=None):
+        return self.data.get("meta", {}).get(key, default)
+
+    def set_meta(self, key, value):
+        self.data.setdefault("meta", {})[key] = value
+        self.flush()
+
+    def flush(self):
+        with self.filepath.open("w") as f:
+            json.dump(self.data, f, indent=2)
+
+    def close(self):
+        pass
+
+
+class SQLiteMemoryStore:
+    """Indexed SQLite storage in WAL mode with batched commits.
+
+    WAL lets other processes (dashboards, metrics scripts) read while the
+    agent writes. Writes are committed every `batch_size` results or
+    `commit_interval` seconds, and on flush/close/exit.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS urls (
+        url TEXT PRIMARY KEY,
+        method TEXT NOT NULL,
+        result TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS results (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        category TEXT NOT NULL,
+        domain TEXT NOT NULL,
+        method TEXT NOT NULL,
+        success INTEGER NOT NULL,
+        time REAL,
+        friction REAL,
+        result TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_results_category ON results (category, domain, method);
+    CREATE INDEX IF NOT EXISTS idx_results_domain ON results (domain, category);
+    CREATE INDEX IF NOT EXISTS idx_results_domain_method ON results (domain, method);
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS method_stats (
+        scope TEXT NOT NULL,
+        key TEXT NOT NULL,
+        method TEXT NOT NULL,
+        successes REAL NOT NULL,
+        total REAL NOT NULL,
+        time_sum REAL NOT NULL,
+        time_sq_sum REAL NOT NULL,
+        friction_sum REAL NOT NULL,
+        updated_at REAL,
+        PRIMARY KEY (scope, key, method)
+    );
+    CREATE TABLE IF NOT EXISTS circuit_breakers (
+        domain TEXT NOT NULL,
+        method TEXT NOT NULL,
+        failures INTEGER NOT NULL,
+        state TEXT NOT NULL,
+        opened_at REAL,
+        updated_at REAL,
+        PRIMARY KEY (domain, method)
+    );
+    """
+
+    def __init__(self, filepath, legacy_json=None, max_recent=None, batch_size=20, commit_interval=5.0):
+        self.filepath = Path(filepath)
+        self.max_recent = max_recent
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+        self.conn = sqlite3.connect(str(self.filepath), check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(method_stats)")]
+        if "updated_at" not in columns:
+            self.conn.execute("ALTER TABLE method_stats ADD COLUMN updated_at REAL")
+        self.conn.commit()
+        atexit.register(self.close)
+
+        if legacy_json and Path(legacy_json).exists() and self.get_meta("migrated_from") is None:
+            self.migrate_from_json(legacy_json)
+
+    def migrate_from_json(self, path):
+        """One-time import of an existing ax_memory.json."""
+        with open(path) as f:
+            data = json.load(f)
+
+        with self._lock, self.conn:
+            for url, entry in data.get("urls", {}).items():
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO urls (url, method, result) VALUES (?, ?, ?)",
+                    (url, entry["method"], json.dumps(entry["result"])),
+                )
+            rows = 0
+            for category, domains in data.get("categories", {}).items():
+                for domain, methods in domains.items():
+                    for method, results in methods.items():
+                        for result in results:
+                            self._insert_result(category, domain, method, result)
+                            rows += 1
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)", (json.dumps(str(path)),)
+            )
+        print(f"[INFO] Migrated {rows} result(s) from {path} into {self.filepath}")
+
+    def _insert_result(self, category, domain, method, result):
+        self.conn.execute(
+            "INSERT INTO results (category, domain, method, success, time, friction, result) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (category, domain, method, int(bool(result.get("success"))),
+             result.get("time"), result.get("friction"), json.dumps(result)),
+        )
+
+    def get_url(self, url):
+        with self._lock:
+            row = self.conn.execute("SELECT method, result FROM urls WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return {}
+        return {"method": row[0], "result": json.loads(row[1])}
+
+    def urls(self):
+        """(url, {"method", "result"}) for every URL with a stored result."""
+        with self._lock:
+            rows = self.conn.execute("SELECT url, method, result FROM urls").fetchall()
+        for url, method, result in rows:
+            yield url, {"method": method, "result": json.loads(result)}
+
+    def categories(self):
+        with self._lock:
+            rows = self.conn.execute("SELECT category, domain, method, result FROM results ORDER BY id").fetchall()
+        tree = {}
+        for category, domain, method, result in rows:
+            tree.setdefault(category, {}).setdefault(domain, {}).setdefault(method, []).append(json.loads(result))
+        return tree
+
+    def category_tree(self, category):
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT domain, method, result FROM results WHERE category = ? ORDER BY id", (category,)
+            ).fetchall()
+        tree = {}
+        for domain, method, result in rows:
+            tree.setdefault(domain, {}).setdefault(method, []).append(json.loads(result))
+        return tree
+
+    def domain_categories(self):
+        """(domain, category) pairs, a domain's first category first."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT domain, category, MIN(id) FROM results GROUP BY domain, category ORDER BY 3"
+            ).fetchall()
+        for domain, category, _ in rows:
+            yield domain, category
+
+    def recent_results(self, domain, method, limit):
+        """Newest-last raw results for one (domain, method), across categories."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT result FROM results WHERE domain = ? AND method = ? ORDER BY id DESC LIMIT ?",
+                (domain, method, limit),
+            ).fetchall()
+        return [json.loads(row[0]) for row in reversed(rows)]
+
+    def append(self, url, domain, category, method, result):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO urls (url, method, result) VALUES (?, ?, ?)",
+                (url, method, json.dumps(result)),
+            )
+            self._insert_result(category, domain, method, result)
+            if self.max_recent:
+                self.conn.execute(
+                    "DELETE FROM results WHERE id IN (SELECT id FROM results WHERE category = ? AND domain = ? AND method = ? "
+                    "ORDER BY id DESC LIMIT -1 OFFSET ?)",
+                    (category, domain, method, self.max_recent),
+                )
+            self._pending += 1
+            if self._pending >= self.batch_size or time.monotonic() - self._last_commit >= self.commit_interval:
+                self.flush()
+
+    def load_method_stats(self):
+        """(scope, key, method, counters) rows; scope is "category" or "domain"."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT scope, key, method, successes, total, time_sum, time_sq_sum, friction_sum, updated_at FROM method_stats"
+            ).fetchall()
+        for scope, key, method, *values in rows:
+            yield scope, key, method, dict(zip(MethodStats.FIELDS, values))
+
+    def save_method_stats(self, scope, key, method, counters, flush=True):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO method_stats "
+                "(scope, key, method, successes, total, time_sum, time_sq_sum, friction_sum, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (scope, key, method, *(counters[field] for field in MethodStats.FIELDS)),
+            )
+            self._pending += 1
+            if flush and (self._pending >= self.batch_size or time.monotonic() - self._last_commit >= self.commit_interval):
+                self.flush()
+
+    def delete_method_stats(self, scope, key, method):
+        with self._lock:
+            self.conn.execute("DELETE FROM method_stats WHERE scope = ? AND key = ? AND method = ?", (scope, key, method))
+
+    def load_breakers(self):
+        """(domain, method, entry) for every circuit breaker that is not plainly closed."""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT domain, method, failures, state, opened_at, updated_at FROM circuit_breakers"
+            ).fetchall()
+        for domain, method, failures, state, opened_at, updated_at in rows:
+            yield domain, method, {"failures": failures, "state": state, "opened_at": opened_at, "updated_at": updated_at}
+
+    def save_breaker(self, domain, method, entry):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO circuit_breakers (domain, method, failures, state, opened_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (domain, method, entry["failures"], entry["state"], entry.get("opened_at"), entry.get("updated_at")),
+            )
+            self._pending += 1
+
+    def delete_breaker(self, domain, method):
+        with self._lock:
+            self.conn.execute("DELETE FROM circuit_breakers WHERE domain = ? AND method = ?", (domain, method))
+            self._pending += 1
+
+    def compact(self):
+        """Trims every (category, domain, method) to the retention ring and reclaims file space."""
+        with self._lock:
+            removed = 0
+            if self.max_recent:
+                removed = self.conn.execute(
+                    "DELETE FROM results WHERE id IN (SELECT id FROM (SELECT id, ROW_NUMBER() OVER "
+                    "(PARTITION BY category, domain, method ORDER BY id DESC) AS rn FROM results) WHERE rn > ?)",
+                    (self.max_recent,),
+                ).rowcount
+            self.flush()
+            self.conn.execute("VACUUM")
+            return removed
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key, value):
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+            self._pending += 1
+
+    def flush(self):
+        with self._lock:
+            self.conn.commit()
+            self._pending = 0
+            self._last_commit = time.monotonic()
+
+    def close(self):
+        with self._lock:
+            if self.conn is None:
+                return
+            self.flush()
+            self.conn.close()
+            self.conn = None
+        atexit.unregister(self.close)
+
+
+def open_store(filepath, legacy_json=None, max_recent=None):
+    """Picks the storage engine from the file extension (.db/.sqlite → SQLite, else JSON)."""
+    if Path(filepath).suffix in (".db", ".sqlite", ".sqlite3"):
+        return SQLiteMemoryStore(filepath, legacy_json=legacy_json, max_recent=max_recent)
+    return JSONMemoryStore(filepath, max_recent=max_recent)
@@ -0,0 +1,81 @@
+import math
+import time
+
+
+class MethodStats:
+    """Running counters for one (scope, method) pair, updated in O(1) per result.
+
+    With a `half_life` (seconds) every counter decays exponentially with age,
+    so old history keeps shrinking in weight and stale choices age out.
+    """
+
+    FIELDS = ("successes", "total", "time_sum", "time_sq_sum", "friction_sum", "updated_at")
+    DECAYED = ("successes", "total", "time_sum", "time_sq_sum", "friction_sum")
+
+    def __init__(self, successes=0.0, total=0.0, time_sum=0.0, time_sq_sum=0.0, friction_sum=0.0,
+                 updated_at=None, half_life=None):
+        self.successes = successes
+        self.total = total
+        self.time_sum = time_sum
+        self.time_sq_sum = time_sq_sum
+        self.friction_sum = friction_sum
+        self.updated_at = updated_at or time.time()
+        self.half_life = half_life
+
+    def decay(self, now=None):
+        """Ages the counters to `now`; a no-op without a half-life."""
+        now = now or time.time()
+        if self.half_life and now > self.updated_at:
+            factor = 0.5 ** ((now - self.updated_at) / self.half_life)
+            for field in self.DECAYED:
+                setattr(self, field, getattr(self, field) * factor)
+        self.updated_at = max(now, self.updated_at)
+
+    def add(self, result, now=None):
+        self.decay(now)
+        elapsed = float(result.get("time") or 0.0)
+        self.successes += 1 if result.get("success") else 0
+        self.total += 1
+        self.time_sum += elapsed
+        self.time_sq_sum += elapsed * elapsed
+        self.friction_sum += float(result.get("friction", 2.0) or 0.0)
+
+    @property
+    def success_rate(self):
+        return self.successes / self.total if self.total else 0.0
+
+    @property
+    def smoothed_success_rate(self):
+        """Laplace-smoothed rate: thin or decayed evidence drifts back towards 0.5."""
+        return (self.successes + 1) / (self.total + 2)
+
+    @property
+    def mean_time(self):
+        return self.time_sum / self.total if self.total else 0.0
+
+    @property
+    def time_std(self):
+        if not self.total:
+            return 0.0
+        variance = self.time_sq_sum / self.total - self.mean_time ** 2
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def mean_friction(self):
+        return self.friction_sum / self.total if self.total else 2.0
+
+    def summary(self):
+        return {
+            "success_rate": self.success_rate,
+            "friction": self.mean_friction,
+            "mean_time": self.mean_time,
+            "time_std": self.time_std,
+            "total": self.total,
+        }
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    @classmethod
+    def from_dict(cls, data, half_life=None):
+        return cls(**{field: data.get(field) or 0.0 for field in cls.FIELDS}, half_life=half_life)
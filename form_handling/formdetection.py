@@ -3,9 +3,6 @@ import random
 import time
 from typing import Optional, List, Tuple
 
-# BeautifulSoup for post-JavaScript HTML parsing
-from bs4 import BeautifulSoup
-
 # Selenium imports
 import undetected_chromedriver as uc
 from seleniumwire import webdriver
@@ -22,6 +19,9 @@ from selenium.common.exceptions import (
 )
 from webdriver_manager.chrome import ChromeDriverManager
 
+from agent.html_document import HTMLDocument
+from agent.page_readiness import READY_TIMEOUT, wait_for_page_ready
+
 # ------------------------------------
 # Configure Logging (optional)
 # ------------------------------------
@@ -160,25 +160,17 @@ def locate_field_in_shadow_root(driver, shadow_host_selector: str, inner_selecto
 # ------------------------------------
 # Step 1: Gather all forms from the rendered DOM (post-JS)
 # ------------------------------------
-def gather_forms_from_dom(driver):
+def gather_forms_from_dom(driver, timeout=READY_TIMEOUT, document=None):
     """
-    Waits for form tags in the live DOM, then uses BeautifulSoup to parse them.
+    Waits until the page has settled (network idle, DOM quiet, at most `timeout`
+    seconds), then parses the rendered forms.
+    Pass an already-parsed HTMLDocument of the page to skip the wait and re-parse.
     Returns a list of <form> elements as BeautifulSoup objects.
     """
-    try:
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_all_elements_located((By.TAG_NAME, "form"))
-        )
-        time.sleep(2)  # Additional buffer for JS rendering
-    except TimeoutException:
-        logger.warning("No <form> elements found within 15 seconds.")
-        return []
-
-    # Parse the rendered HTML with BeautifulSoup
-    html = driver.page_source
-    soup = BeautifulSoup(html, "html.parser")
-    forms = soup.find_all("form")
-    return forms
+    if document is None:
+        wait_for_page_ready(driver, timeout=timeout)
+        document = HTMLDocument(driver.page_source)
+    return document.forms()
 
 # ------------------------------------
 # Step 2: Detect fields in a single <form> by multiple attributes
@@ -4,9 +4,14 @@ from agent.task_executor import TaskExecutor
 from ax.ax_memory import AXMemory
 from ax.ax_policy_engine import AXPolicyEngine
 from ax.experience_logger import ExperienceLogger
+from utils.blocking import run_blocking
 from urllib.parse import urlparse
 import matplotlib.pyplot as plt
 AUTO_SKIP_FORMS = True  # Set to False for interactive mode
+CONCURRENT_MODE = True  # Set to False to process URLs one at a time
+MAX_CONCURRENCY = 8  # URLs in flight across all domains
+PER_DOMAIN_CONCURRENCY = 1  # URLs in flight per domain
+EXPLORATION_BUDGET = 0.2  # share of method choices the bandit may spend on exploration
 import csv
 
 # Load benchmark ground truth
@@ -21,80 +26,96 @@ with open("benchmark_suite.csv", newline='') as csvfile:
         }
 
 
+async def process_url(url, memory, policy, executor):
+    print(f"\n🔗 Processing: {url}")
+
+    # === Prepare base config ===
+    config = {
+        "expect_form": "form" in url,
+        "prefer_speed": not ("captcha" in url),
+        "fill_forms": AUTO_SKIP_FORMS,
+        "true_category": None,
+        "expected_method": None,
+        "has_form_expected": False
+    }
+
+    # Inject CSV ground truth if available
+    if url in ground_truth:
+        config["true_category"] = ground_truth[url]["true_category"]
+        config["expected_method"] = ground_truth[url]["expected_method"]
+        config["has_form_expected"] = ground_truth[url]["has_form_expected"]
+
+
+    memory_hit = False
+    method_source = "policy"  # default fallback
+    method = None
+
+    try:
+        method, method_source = await run_blocking(policy.decide, url, config)
+        memory_hit = method_source in ("domain", "explore")
+
+        # Add metadata before execution
+        config.update({
+            "memory_hit": memory_hit,
+            "method_source": method_source
+        })
+
+        result = await executor.run(method, url, config)
+
+        result.setdefault("time", 0.0)
+        result.setdefault("friction", 2.0)
+        result.setdefault("success", False)
+
+        final_method = result.get("final_method", method)
+
+        print(f"[LOG] {final_method.upper()} - Success: {result['success']}, Time: {result['time']}s, Friction: {result['friction']}")
+        return (url, final_method, result["success"], result["time"], result["friction"])
+
+    except Exception as e:
+        print(f"[ERROR] Failed to process {url}: {e}")
+        return (url, method if method else 'unknown', False, 0.0, 2.0)
+
+
+async def run_concurrent(websites, memory, policy, executor):
+    """Processes URLs concurrently under a global and a per-domain cap.
+
+    Metrics come back in input order. URLs on the same domain are admitted in
+    list order, so with PER_DOMAIN_CONCURRENCY = 1 a repeated URL still sees the
+    memory written by its earlier visit, exactly as in a sequential run.
+    """
+    global_slots = asyncio.Semaphore(MAX_CONCURRENCY)
+    domain_slots = {}
+
+    async def worker(url):
+        domain = urlparse(url).netloc.lower()
+        slot = domain_slots.setdefault(domain, asyncio.Semaphore(PER_DOMAIN_CONCURRENCY))
+        async with slot:
+            async with global_slots:
+                return await process_url(url, memory, policy, executor)
+
+    return await asyncio.gather(*(worker(url) for url in websites))
+
+
 async def main():
     with open("websites.txt", "r") as file:
         websites = [line.strip() for line in file.readlines() if line.strip()]
 
-    memory = AXMemory()
-    policy = AXPolicyEngine(memory)
+    memory = AXMemory("ax_memory.db")  # SQLite engine; ax_memory.json is migrated on first run
+    policy = AXPolicyEngine(memory, exploration_budget=EXPLORATION_BUDGET)
     executor = TaskExecutor(memory)
 
-    metrics = []
-
-    for url in websites:
-        print(f"\n🔗 Processing: {url}")
-
-        # === Prepare base config ===
-        config = {
-            "expect_form": "form" in url,
-            "prefer_speed": not ("captcha" in url),
-            "fill_forms": AUTO_SKIP_FORMS,
-            "true_category": None,
-            "expected_method": None,
-            "has_form_expected": False
-        }
-
-        # Inject CSV ground truth if available
-        if url in ground_truth:
-            config["true_category"] = ground_truth[url]["true_category"]
-            config["expected_method"] = ground_truth[url]["expected_method"]
-            config["has_form_expected"] = ground_truth[url]["has_form_expected"]
-
-
-        memory_hit = False
-        method_source = "policy"  # default fallback
-        method = None
-
-        try:
-            url_result = memory.get(url)
-            if url_result and url_result.get("result", {}).get("success"):
-                method = url_result["method"]
-                memory_hit = True
-                method_source = "url"
-                print(f"[INFO] Reusing previous successful method: {method} for {url}")
-            else:
-                domain = urlparse(url).netloc
-                category = memory.get_category_by_domain(domain)
-                if category:
-                    method = memory.get_best_method_for_category(category)
-                    memory_hit = True
-                    method_source = "domain"
-                    print(f"[INFO] Found similar domain category: {category}")
-                    print(f"[INFO] Using best method for category: {method}")
-                else:
-                    method, method_source = policy.decide(url, config)
-
-
-            # Add metadata before execution
-            config.update({
-                "memory_hit": memory_hit,
-                "method_source": method_source
-            })
-
-            result = await executor.run(method, url, config)
-
-            result.setdefault("time", 0.0)
-            result.setdefault("friction", 2.0)
-            result.setdefault("success", False)
-
-            final_method = result.get("final_method", method)
-
-            print(f"[LOG] {final_method.upper()} - Success: {result['success']}, Time: {result['time']}s, Friction: {result['friction']}")
-            metrics.append((url, final_method, result["success"], result["time"], result["friction"]))
-
-        except Exception as e:
-            print(f"[ERROR] Failed to process {url}: {e}")
-            metrics.append((url, method if method else 'unknown', False, 0.0, 2.0))
+    try:
+        if CONCURRENT_MODE:
+            print(f"[INFO] Concurrent mode: {MAX_CONCURRENCY} global, {PER_DOMAIN_CONCURRENCY} per domain")
+            metrics = await run_concurrent(websites, memory, policy, executor)
+        else:
+            metrics = []
+            for url in websites:
+                metrics.append(await process_url(url, memory, policy, executor))
+    finally:
+        await executor.aclose()
+        memory.close()
+        print(f"[INFO] Method bandit: {policy.bandit.stats()}")
 
 
     # === PLOT METRICS ===
@@ -1,4 +1,3 @@
-import aiohttp
 import asyncio
 from seleniumwire import webdriver  # For network intercept
 from selenium.webdriver.chrome.service import Service
@@ -39,7 +38,6 @@ import logging
 import random
 from concurrent.futures import ThreadPoolExecutor
 import asyncio
-import aiohttp
 from dotenv import load_dotenv
 from bs4 import BeautifulSoup
 from selenium.webdriver.common.action_chains import ActionChains
@@ -47,6 +45,11 @@ from selenium.common.exceptions import MoveTargetOutOfBoundsException
 from form_handling.formdetection import (
     fill_all_forms,  # main function that detects & fills forms
 )
+from agent.http_client import USER_AGENT, get_http_client
+from agent.render_profile import HEADLESS_TEXT_PROFILE
+from utils.content_reducer import reduce_content
+from utils.extractive_summarizer import summarize_extractive
+from utils.llm_client import ANALYZE_DEADLINE
 # Load environment variables
 load_dotenv()
 api_key = os.getenv("OPENAI_API_KEY")
@@ -57,8 +60,6 @@ CAPTCHA_API_KEY = os.getenv("CAPTCHA_API_KEY")
 solver = TwoCaptcha(CAPTCHA_API_KEY)
 
 
-# Set human-like User-Agent
-USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/110.0.0.0 Safari/537.36"
 def suppress_seleniumwire_logs_during_input():
     """
     Helper to temporarily suppress seleniumwire logs while user is typing.
@@ -101,7 +102,7 @@ def get_local_chrome_version():
         except Exception:
             return None
 
-def configure_driver():
+def configure_driver(profile=HEADLESS_TEXT_PROFILE):
     options = ChromeOptions()
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_argument("--disable-infobars")
@@ -110,6 +111,7 @@ def configure_driver():
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--disable-webrtc")
     options.add_argument(f"user-agent={USER_AGENT}")
+    profile.apply_options(options)
 
     driver_path = ChromeDriverManager().install()
     print(f"[INFO] Using ChromeDriver: {driver_path}")
@@ -171,6 +173,7 @@ def start_browser(url):
     """Launches the browser, attempts to bypass CAPTCHA, and proceeds with scraping."""
     print(f"[INFO] Launching browser to access: {url}")
     driver = configure_driver()
+    HEADLESS_TEXT_PROFILE.apply_to_driver(driver, url)
     driver.get(url)
     time.sleep(5)  # Wait for page to load
     window_size = driver.get_window_size()
@@ -228,14 +231,11 @@ def scrape_page(driver):
     combined_content = static_content + "\n\n--- Dynamic Content ---\n\n" + dynamic_content
     return combined_content, static_status + "; " + dynamic_status
 
-import re  # Add to your imports if not already present
-
 def process_web_content(content):
     print("Processing Web Content...")
 
-    # Clean and truncate content
-    cleaned = re.sub(r'\s+', ' ', content)
-    content_to_send = cleaned[:3000]
+    # Keep only the most informative blocks within the token budget
+    content_to_send = reduce_content(content)
 
     # Create assistant
     assistant = client.beta.assistants.create(
@@ -260,11 +260,16 @@ def process_web_content(content):
         instructions="Focus on summarizing the most important content from the user's message."
     )
 
-    # Poll run status
+    # Poll run status, up to the deadline
+    deadline = time.monotonic() + ANALYZE_DEADLINE
     while True:
         current_run = client.beta.threads.runs.retrieve(thread_id=thread.id, run_id=run.id)
         if current_run.status == "completed":
             break
+        elif time.monotonic() >= deadline:
+            print("[WARN] LLM run missed its deadline; local extractive summary (degraded):")
+            print(summarize_extractive(content))
+            return
         elif current_run.status in ["failed", "cancelled", "expired"]:
             print(f"Run status: {current_run.status}")
             if current_run.last_error:
@@ -281,21 +286,18 @@ def process_web_content(content):
 async def check_direct_api(url):
     """Checks for direct API access before attempting scraping."""
     try:
-        headers = {"User-Agent": USER_AGENT}
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, timeout=10) as resp:
-                if resp.status == 200:
-                    print(f"[INFO] Direct API success: {url}")
-                    return await resp.json()
-                else:
-                    print(f"[ERROR] API call failed with status code {resp.status}")
+        resp = await get_http_client().get(url, timeout=10)
+        if resp.status_code == 200:
+            print(f"[INFO] Direct API success: {url}")
+            return resp.json()
+        else:
+            print(f"[ERROR] API call failed with status code {resp.status_code}")
     except Exception as e:
         print(f"[ERROR] Direct API error: {e}")
     return None
 
 # Asynchronous API Path Enumeration with Crawl4AI Integration
 async def async_api_check(url, paths):
-    headers = {"User-Agent": "Mozilla/5.0"}
     extraction_strategy = LLMExtractionStrategy(
         provider="openai/gpt-4o",
         api_token=api_key,
@@ -303,22 +305,23 @@ async def async_api_check(url, paths):
         instruction="Extract API endpoints or references from web content or JSON data."
     )
 
-    async with aiohttp.ClientSession() as session:
-        tasks = [
-            session.get(f"{url.rstrip('/')}{path}", headers=headers) for path in paths
-        ]
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
-
-        for response in responses:
-            if isinstance(response, Exception):
-                print(f"Request failed: {response}")
-                continue
-            if response.status == 200:
-                print(f"Potential API response at {response.url}")
-                extracted_content = extraction_strategy.extract_from_text(await response.text())
-                if extracted_content:
-                    print("Extracted API content with LLM:", extracted_content)
-                    return extracted_content
+    # One pooled client: the probes reuse the same connection(s) to the host
+    http = get_http_client()
+    tasks = [
+        http.get(f"{url.rstrip('/')}{path}") for path in paths
+    ]
+    responses = await asyncio.gather(*tasks, return_exceptions=True)
+
+    for response in responses:
+        if isinstance(response, Exception):
+            print(f"Request failed: {response}")
+            continue
+        if response.status_code == 200:
+            print(f"Potential API response at {response.url}")
+            extracted_content = extraction_strategy.extract_from_text(response.text)
+            if extracted_content:
+                print("Extracted API content with LLM:", extracted_content)
+                return extracted_content
     return None
 
 
@@ -0,0 +1,17 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+BLOCKING_WORKERS = 16  # threads for short blocking calls (LLM SDK, file I/O, requests)
+
+_default_executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS, thread_name_prefix="ax-blocking")
+
+
+async def run_blocking(func, *args, executor=None, **kwargs):
+    """Runs a blocking call on a bounded thread pool so the event loop keeps serving other URLs.
+
+    Long-running work (browser sessions) should pass its own executor so it
+    cannot starve the shared pool used by the API and LLM paths.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or _default_executor, functools.partial(func, *args, **kwargs))
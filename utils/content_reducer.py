@@ -0,0 +1,88 @@
+import math
+import re
+
+from agent.html_document import HTMLDocument
+
+TOKEN_BUDGET = 750  # roughly the old 3000-character slice
+CHARS_PER_TOKEN = 4  # rough English average; only used to size the budget
+DYNAMIC_SEPARATOR = "--- Dynamic Content ---"
+MAX_BLOCK_CHARS = 600  # longer blocks are split into sentences before ranking
+SHORT_BLOCK_WORDS = 4  # menu items, buttons and breadcrumbs are usually shorter
+
+BOILERPLATE_RE = re.compile(
+    r"\b(cookies?|accept all|reject all|consent|privacy (policy|settings)|terms (of use|and conditions)|"
+    r"all rights reserved|skip to (main )?content|sign (in|up)|log ?in|subscribe|newsletter|"
+    r"follow us|share (on|this)|back to top|javascript is (disabled|required)|enable javascript)\b",
+    re.IGNORECASE,
+)
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+NORMALIZE_RE = re.compile(r"[^a-z0-9]+")
+HTML_RE = re.compile(r"^\s*<(!doctype|html|head|body|div)\b", re.IGNORECASE)
+
+
+def estimate_tokens(text):
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def reduce_content(text, token_budget=TOKEN_BUDGET):
+    """Cuts page text down to its most informative blocks within `token_budget`.
+
+    Raw HTML is reduced to its main content first. The text is then split into
+    blocks, boilerplate (cookie banners, menus, sign-in prompts) is dropped,
+    blocks repeated between the static and dynamic halves are kept once, and
+    the highest-scoring blocks fill the budget in their original order.
+    """
+    text = text or ""
+    if HTML_RE.match(text):
+        text = HTMLDocument(text).main_text()
+
+    budget_chars = token_budget * CHARS_PER_TOKEN
+    blocks = _blocks(text)
+    if sum(len(block) + 1 for block in blocks) <= budget_chars:
+        return "\n".join(blocks)
+
+    ranked = sorted(range(len(blocks)), key=lambda i: _score(blocks[i], i), reverse=True)
+    chosen, used = set(), 0
+    for index in ranked:
+        size = len(blocks[index]) + 1
+        if used + size > budget_chars:
+            continue
+        chosen.add(index)
+        used += size
+    if not chosen and blocks:
+        return blocks[ranked[0]][:budget_chars]
+    return "\n".join(blocks[i] for i in sorted(chosen))
+
+
+def _blocks(text):
+    """Non-empty, whitespace-collapsed, de-duplicated blocks with boilerplate removed."""
+    blocks, seen = [], set()
+    for line in text.replace(DYNAMIC_SEPARATOR, "\n").splitlines():
+        line = " ".join(line.split())
+        if not line:
+            continue
+        pieces = SENTENCE_END_RE.split(line) if len(line) > MAX_BLOCK_CHARS else [line]
+        for piece in pieces:
+            key = NORMALIZE_RE.sub(" ", piece.lower()).strip()
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            hits = len(BOILERPLATE_RE.findall(piece))
+            if hits > 1 or (hits and len(piece.split()) < 2 * SHORT_BLOCK_WORDS):
+                continue  # a short block or a banner dominated by boilerplate phrases
+            blocks.append(piece)
+    return blocks
+
+
+def _score(block, position):
+    """Favours long, sentence-like, letter-heavy blocks near the top of the page."""
+    words = len(block.split())
+    letters = sum(ch.isalpha() for ch in block) / len(block)
+    score = min(words, 60) / 60 * letters
+    if block[-1] in ".!?":
+        score += 0.3
+    if any(ch.isdigit() for ch in block):
+        score += 0.1  # dates, prices, figures
+    if words < SHORT_BLOCK_WORDS:
+        score *= 0.5
+    return score / (1 + position / 100)
@@ -0,0 +1,54 @@
+import math
+import re
+
+from utils.content_reducer import reduce_content
+
+SUMMARY_SENTENCES = 5
+MIN_SENTENCE_WORDS = 5
+MAX_SENTENCE_WORDS = 60
+
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+WORD_RE = re.compile(r"[a-z][a-z0-9'-]+")
+STOPWORDS = set("""
+a about above after again against all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her here
+hers him his how i if in into is it its itself just me more most my no nor not now of off on once only or other
+our ours out over own same she should so some such than that the their theirs them then there these they this
+those through to too under until up very was we were what when where which while who whom why will with would
+you your yours
+""".split())
+
+
+def summarize_extractive(text, max_sentences=SUMMARY_SENTENCES):
+    """A CPU-only summary: the highest-ranked sentences of the cleaned text, in page order.
+
+    Sentences are scored by the average document frequency of their content
+    words (a plain SumBasic-style ranking), with a small bonus for sentences
+    near the top of the page and for ones carrying figures or dates.
+    """
+    sentences = []
+    for raw in SENTENCE_RE.split(reduce_content(text)):
+        sentence = raw.strip()
+        words = WORD_RE.findall(sentence.lower())
+        if MIN_SENTENCE_WORDS <= len(sentence.split()) <= MAX_SENTENCE_WORDS:
+            sentences.append((sentence, [w for w in words if w not in STOPWORDS]))
+    if not sentences:
+        return reduce_content(text, token_budget=60)
+
+    frequency = {}
+    for _, words in sentences:
+        for word in words:
+            frequency[word] = frequency.get(word, 0) + 1
+    top = max(frequency.values(), default=1)
+
+    def score(index):
+        sentence, words = sentences[index]
+        if not words:
+            return 0.0
+        value = sum(frequency[w] / top for w in words) / math.sqrt(len(words))
+        if any(ch.isdigit() for ch in sentence):
+            value *= 1.1
+        return value / (1 + index / 50)
+
+    chosen = sorted(sorted(range(len(sentences)), key=score, reverse=True)[:max_sentences])
+    return " ".join(sentences[i][0] for i in chosen)
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_PATH = "llm_cache.db"
+MEMORY_ENTRIES = 1024  # in-memory LRU in front of the on-disk cache
+MAX_DISK_BYTES = 64 * 1024 * 1024  # least recently used entries are evicted past this
+TTL_SECONDS = 7 * 86400
+
+
+def normalize_content(text):
+    """Whitespace-insensitive form of page content, so trivially re-flowed pages share a key."""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+class LLMCache:
+    """On-disk (SQLite) cache of LLM answers keyed by content hash, prompt and model."""
+
+    def __init__(self, path=CACHE_PATH, memory_entries=MEMORY_ENTRIES, max_bytes=MAX_DISK_BYTES, ttl=TTL_SECONDS):
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache (last_access)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache (created_at)")
+        self.conn.commit()
+        self._disk_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    @staticmethod
+    def make_key(content, prompt, model):
+        digest = hashlib.sha256()
+        for part in (model, prompt, normalize_content(content)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if now - created_at < self.ttl:
+                    self._lru.move_to_end(key)
+                    return value
+                del self._lru[key]
+
+            row = self.conn.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, created_at = json.loads(row[0]), row[1]
+            if now - created_at >= self.ttl:
+                self._delete(key)
+                return None
+            self.conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self._remember(key, value, created_at)
+            return value
+
+    def set(self, key, value):
+        now = time.time()
+        payload = json.dumps(value)
+        with self._lock:
+            old = self.conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now),
+            )
+            self._disk_bytes += len(payload) - (old[0] if old else 0)
+            self._evict(now)
+            self.conn.commit()
+            self._remember(key, value, now)
+
+    def _remember(self, key, value, created_at):
+        self._lru[key] = (value, created_at)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.memory_entries:
+            self._lru.popitem(last=False)
+
+    def _delete(self, key):
+        row = self.conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self.conn.commit()
+            self._disk_bytes -= row[0]
+
+    def _evict(self, now):
+        self._disk_bytes -= self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM llm_cache WHERE created_at <= ?", (now - self.ttl,)
+        ).fetchone()[0]
+        self.conn.execute("DELETE FROM llm_cache WHERE created_at <= ?", (now - self.ttl,))
+        while self._disk_bytes > self.max_bytes:
+            rows = self.conn.execute("SELECT key, size FROM llm_cache ORDER BY last_access LIMIT 64").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self.conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._lru.pop(key, None)
+                self._disk_bytes -= size
+                if self._disk_bytes <= self.max_bytes:
+                    break
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Process-wide cache instance, opened on first use."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = LLMCache()
+        return _shared_cache
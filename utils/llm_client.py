@@ -0,0 +1,195 @@
+import asyncio
+import concurrent.futures
+import json
+import os
+import threading
+
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+from utils.content_reducer import TOKEN_BUDGET, estimate_tokens, reduce_content
+from utils.extractive_summarizer import summarize_extractive
+from utils.llm_cache import get_llm_cache
+from utils.llm_dispatcher import LLMDispatcher
+from utils.local_classifier import get_local_classifier
+
+LLM_MODEL = "gpt-4o"
+RESPONSE_TOKENS = 300  # expected answer size, charged up front against the TPM window
+ANALYZE_DEADLINE = 20.0  # seconds before analyze()/categorize() fall back to a local result
+REQUEST_TIMEOUT = 2 * ANALYZE_DEADLINE  # per HTTP request; late answers still reach the cache, but slots free up
+
+CATEGORIZER_INSTRUCTIONS = """You are a classifier that returns one category for HTML content:
+            jobs, news, ecommerce, academic, media, api, wiki, or other.
+            Respond with just one of those labels, nothing else."""
+ANALYZER_INSTRUCTIONS = """You analyse web page content and reply with a JSON object with exactly two keys:
+            "category": one of jobs, news, ecommerce, academic, media, api, wiki, or other;
+            "summary": the key facts of the page (names, dates, locations, figures), clear and brief."""
+
+
+def normalize_category(response):
+    """Maps a free-text model answer onto one of the AX category labels."""
+    response = response.strip().lower()
+    if "job" in response:
+        return "jobs"
+    elif "news" in response:
+        return "news"
+    elif "ecommerce" in response or "shopping" in response or "retail" in response:
+        return "ecommerce"
+    elif "academic" in response or "education" in response:
+        return "academic"
+    elif "media" in response or "entertainment" in response:
+        return "media"
+    elif "api" in response or "json" in response or "structured" in response:
+        return "api"
+    elif "wiki" in response or "encyclopedia" in response:
+        return "wiki"
+    else:
+        return "other"
+
+
+class LLMClient:
+    """One OpenAI client, prompt config and HTTP connection pool for the whole agent.
+
+    All requests run on a dedicated event-loop thread, so the same client
+    serves `await client.categorize(...)` from the agent's loop and the
+    blocking `categorize_sync(...)` used by synchronous callers. Each call is
+    a single chat completion; there is no assistant/thread/run lifecycle to
+    create or poll. Cache misses go through one `LLMDispatcher`, which owns
+    concurrency, rate limiting, retries and coalescing.
+
+    `analyze` and `categorize` are bounded by `deadline`: past it the caller
+    gets a local extractive summary marked `degraded` (or "other"), while the
+    LLM request keeps running in the background so its answer still lands in
+    the cache. Each HTTP request is cut off after `request_timeout`.
+    """
+
+    def __init__(self, model=LLM_MODEL, cache=None, token_budget=TOKEN_BUDGET, dispatcher=None,
+                 deadline=ANALYZE_DEADLINE, request_timeout=REQUEST_TIMEOUT):
+        load_dotenv()
+        self.model = model
+        self.token_budget = token_budget
+        self.deadline = deadline
+        self.cache = cache or get_llm_cache()
+        self.dispatcher = dispatcher or LLMDispatcher()
+        # retries are the dispatcher's job, so they respect its limits
+        self._client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0, timeout=request_timeout)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-loop", daemon=True)
+        self._thread.start()
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def categorize(self, text, deadline=None):
+        """Category label; "other" if the LLM misses `deadline`."""
+        future = asyncio.wrap_future(self._submit(self._categorize(text)))
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.deadline if deadline is None else deadline)
+        except asyncio.TimeoutError:
+            print("[WARN] LLM missed its deadline; categorizing as 'other'")
+            return "other"
+
+    async def summarize(self, text):
+        return (await self.analyze(text))["summary"]
+
+    async def analyze(self, text, deadline=None):
+        """Category and summary from one round trip: {"category", "summary", "degraded"}."""
+        future = asyncio.wrap_future(self._submit(self._analyze(text)))
+        try:
+            # shield: on timeout only our wait is cancelled, not the request
+            return await asyncio.wait_for(asyncio.shield(future), self.deadline if deadline is None else deadline)
+        except asyncio.TimeoutError:
+            return self._degraded(text)
+
+    def categorize_sync(self, text, deadline=None):
+        try:
+            return self._submit(self._categorize(text)).result(timeout=self.deadline if deadline is None else deadline)
+        except concurrent.futures.TimeoutError:
+            print("[WARN] LLM missed its deadline; categorizing as 'other'")
+            return "other"
+
+    def summarize_sync(self, text):
+        return self.analyze_sync(text)["summary"]
+
+    def analyze_sync(self, text, deadline=None):
+        try:
+            return self._submit(self._analyze(text)).result(timeout=self.deadline if deadline is None else deadline)
+        except concurrent.futures.TimeoutError:
+            return self._degraded(text)
+
+    def _degraded(self, text):
+        print("[WARN] LLM missed its deadline; using a local extractive summary")
+        try:
+            category = get_local_classifier().classify(text)
+        except (OSError, ValueError):
+            category = None
+        return {"category": category, "summary": summarize_extractive(text), "degraded": True}
+
+    async def _categorize(self, text):
+        answer = await self._complete(CATEGORIZER_INSTRUCTIONS, self._prepare(text))
+        return normalize_category(answer)
+
+    async def _analyze(self, text):
+        answer = await self._complete(ANALYZER_INSTRUCTIONS, self._prepare(text), json_output=True)
+        try:
+            parsed = json.loads(answer)
+        except json.JSONDecodeError:
+            parsed = {"category": answer, "summary": answer}
+        return {
+            "category": normalize_category(str(parsed.get("category", ""))),
+            "summary": str(parsed.get("summary", "")).strip(),
+            "degraded": False,
+        }
+
+    def _prepare(self, text):
+        return reduce_content(text, self.token_budget)
+
+    async def _complete(self, instructions, content, json_output=False):
+        cache_key = self.cache.make_key(content, instructions, self.model)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            print("[CACHE] LLM hit")
+            return cached
+
+        async def request():
+            response = await self._client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": instructions},
+                    {"role": "user", "content": content},
+                ],
+                temperature=0,
+                **({"response_format": {"type": "json_object"}} if json_output else {}),
+            )
+            usage = getattr(response, "usage", None)
+            return response.choices[0].message.content or "", usage.total_tokens if usage else None
+
+        estimated = estimate_tokens(instructions) + estimate_tokens(content) + RESPONSE_TOKENS
+        answer = await self.dispatcher.submit(cache_key, request, estimated)
+        self.cache.set(cache_key, answer)
+        return answer
+
+    def stats(self):
+        """Dispatcher queue depth, wait times and counters."""
+        return self.dispatcher.stats()
+
+    def close(self):
+        if not self._loop.is_running():
+            return
+        print(f"[INFO] LLM dispatcher stats: {self.stats()}")
+        self._submit(self._client.close()).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_client():
+    """Process-wide client, created on first use."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None or not _shared_client._thread.is_alive():
+            _shared_client = LLMClient()
+        return _shared_client
@@ -0,0 +1,156 @@
+import asyncio
+import random
+import time
+from collections import deque
+
+from openai import APIConnectionError, APIStatusError, APITimeoutError
+
+MAX_IN_FLIGHT = 4
+TOKENS_PER_MINUTE = 30000  # keep below the account's TPM limit
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0  # seconds; doubled on every retry and jittered ±50%
+BACKOFF_MAX = 30.0
+
+
+def is_retryable(error):
+    """Rate limits, server errors and dropped connections are worth another try."""
+    if isinstance(error, (APIConnectionError, APITimeoutError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return False
+
+
+def _retry_after(error):
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class LLMDispatcher:
+    """Single gate for all LLM requests made on one event loop.
+
+    Requests wait for one of `max_in_flight` slots and for room in a rolling
+    one-minute token window, are retried with jittered exponential backoff on
+    429/5xx, and identical requests already in flight share one call.
+    """
+
+    def __init__(self, max_in_flight=MAX_IN_FLIGHT, tokens_per_minute=TOKENS_PER_MINUTE,
+                 max_retries=MAX_RETRIES, backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX):
+        self.max_in_flight = max_in_flight
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._pending = {}  # request key -> task shared by coalesced callers
+        self._window = deque()  # (timestamp, tokens) charged in the last minute
+        self._window_tokens = 0
+
+        self.queued = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.retries = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    async def submit(self, key, call, estimated_tokens):
+        """Awaits `call()` (a coroutine factory) under the limits; callers with the same key share one result.
+
+        `call` returns (result, tokens_used); tokens_used may be None if unknown.
+        """
+        task = self._pending.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._run(call, estimated_tokens))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        # shield: one caller giving up must not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _run(self, call, estimated_tokens):
+        enqueued = time.monotonic()
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+            try:
+                await self._reserve(estimated_tokens)
+            except BaseException:
+                self._slots.release()
+                raise
+        finally:
+            self.queued -= 1
+
+        waited = time.monotonic() - enqueued
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        if waited > 1.0:
+            print(f"[INFO] LLM request waited {waited:.1f}s for a slot ({self.queued} still queued)")
+
+        self.in_flight += 1
+        try:
+            result, used = await self._with_retries(call)
+            if used is not None:
+                self._charge(used - estimated_tokens)
+            self.completed += 1
+            return result
+        except BaseException:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self._slots.release()
+
+    async def _with_retries(self, call):
+        attempt = 0
+        while True:
+            try:
+                return await call()
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                delay = min(self.backoff_max, self.backoff_base * 2 ** attempt) * random.uniform(0.5, 1.5)
+                delay = max(delay, _retry_after(e) or 0.0)
+                attempt += 1
+                self.retries += 1
+                print(f"[WARN] LLM request failed ({e.__class__.__name__}); retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    async def _reserve(self, tokens):
+        """Waits until `tokens` fit in the rolling minute; a single oversized request is let through alone."""
+        while True:
+            self._expire(time.monotonic())
+            if not self._window or self._window_tokens + tokens <= self.tokens_per_minute:
+                self._charge(tokens)
+                return
+            await asyncio.sleep(max(self._window[0][0] + 60.0 - time.monotonic(), 0.05))
+
+    def _charge(self, tokens):
+        self._window.append((time.monotonic(), tokens))
+        self._window_tokens += tokens
+
+    def _expire(self, now):
+        while self._window and now - self._window[0][0] >= 60.0:
+            self._window_tokens -= self._window.popleft()[1]
+
+    def stats(self):
+        now = time.monotonic()
+        started = self.completed + self.failed + self.in_flight
+        return {
+            "queue_depth": self.queued,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "coalesced": self.coalesced,
+            "retries": self.retries,
+            "mean_wait": self.wait_total / started if started else 0.0,
+            "max_wait": self.wait_max,
+            "tokens_last_minute": sum(tokens for at, tokens in list(self._window) if now - at < 60.0),
+        }
@@ -0,0 +1,274 @@
+import argparse
+import csv
+import json
+import math
+import os
+import random
+import re
+import statistics
+import threading
+import time
+import zlib
+from urllib.parse import urlparse
+
+from ax.memory_store import open_store
+
+CATEGORIES = ["jobs", "news", "ecommerce", "academic", "media", "api", "wiki", "other"]
+MODEL_PATH = "local_classifier.json"
+MEMORY_PATH = "ax_memory.db"  # the agent's memory; LEGACY_MEMORY_PATH is migrated into it once
+LEGACY_MEMORY_PATH = "ax_memory.json"
+BENCHMARK_PATH = "benchmark_suite.csv"
+
+HASH_DIM = 2 ** 18
+NGRAM_SIZES = (3, 4, 5)
+MAX_TOKENS = 400  # page content is truncated so a prediction stays in the millisecond range
+CONFIDENCE_THRESHOLD = 0.6  # below this the caller should ask the LLM
+EPOCHS = 40
+LEARNING_RATE = 0.5
+L2 = 1e-4
+
+TAG_RE = re.compile(r"<[^>]+>")
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+NOISE_TOKENS = {"http", "https", "www", "html", "htm", "body", "index", "com", "php", "aspx"}
+
+
+def features(text):
+    """Hashed word, word-bigram and character n-gram features, L2-normalised: {bucket: weight}."""
+    text = TAG_RE.sub(" ", (text or "").lower())
+    tokens = [t for t in TOKEN_RE.findall(text) if t not in NOISE_TOKENS][:MAX_TOKENS]
+
+    counts = {}
+
+    def add(feature):
+        bucket = zlib.crc32(feature.encode("utf-8")) % HASH_DIM
+        counts[bucket] = counts.get(bucket, 0.0) + 1.0
+
+    for token in tokens:
+        add("w:" + token)
+        padded = f"<{token}>"
+        for n in NGRAM_SIZES:
+            for i in range(len(padded) - n + 1):
+                add(f"c{n}:" + padded[i:i + n])
+    for first, second in zip(tokens, tokens[1:]):
+        add(f"b:{first}_{second}")
+
+    norm = math.sqrt(sum(v * v for v in counts.values())) or 1.0
+    return {bucket: value / norm for bucket, value in counts.items()}
+
+
+class LocalClassifier:
+    """Multinomial logistic regression over hashed n-grams, in pure Python.
+
+    Trained from the labelled URLs in AX memory and the benchmark suite; it
+    scores a URL or a short page in about a millisecond, so the LLM is only
+    consulted when `classify` is not confident.
+    """
+
+    def __init__(self, classes=None, weights=None, bias=None):
+        self.classes = list(classes or CATEGORIES)
+        self.weights = weights or {}  # bucket -> per-class weights
+        self.bias = bias or [0.0] * len(self.classes)
+
+    def _scores(self, feats):
+        scores = list(self.bias)
+        for bucket, value in feats.items():
+            row = self.weights.get(bucket)
+            if row:
+                for k, w in enumerate(row):
+                    scores[k] += w * value
+        return scores
+
+    @staticmethod
+    def _softmax(scores):
+        top = max(scores)
+        exps = [math.exp(s - top) for s in scores]
+        total = sum(exps)
+        return [e / total for e in exps]
+
+    def predict_proba(self, text):
+        probs = self._softmax(self._scores(features(text)))
+        return dict(zip(self.classes, probs))
+
+    def predict(self, text):
+        """(label, confidence) for the most probable category."""
+        probs = self.predict_proba(text)
+        label = max(probs, key=probs.get)
+        return label, probs[label]
+
+    def classify(self, text, threshold=CONFIDENCE_THRESHOLD):
+        """The predicted label, or None when confidence is below `threshold`."""
+        label, confidence = self.predict(text)
+        return label if confidence >= threshold else None
+
+    def fit(self, examples, epochs=EPOCHS, learning_rate=LEARNING_RATE, l2=L2, seed=0):
+        """SGD on (text, label) pairs; labels outside `classes` are ignored."""
+        index = {label: k for k, label in enumerate(self.classes)}
+        data = [(features(text), index[label]) for text, label in examples if label in index]
+        rng = random.Random(seed)
+        n_classes = len(self.classes)
+
+        for epoch in range(epochs):
+            rng.shuffle(data)
+            rate = learning_rate / (1.0 + 0.1 * epoch)
+            for feats, target in data:
+                probs = self._softmax(self._scores(feats))
+                grads = [p - (1.0 if k == target else 0.0) for k, p in enumerate(probs)]
+                for k in range(n_classes):
+                    self.bias[k] -= rate * grads[k]
+                for bucket, value in feats.items():
+                    row = self.weights.setdefault(bucket, [0.0] * n_classes)
+                    for k in range(n_classes):
+                        row[k] -= rate * (grads[k] * value + l2 * row[k])
+        return self
+
+    def save(self, path=MODEL_PATH):
+        with open(path, "w") as f:
+            json.dump({
+                "classes": self.classes,
+                "hash_dim": HASH_DIM,
+                "bias": self.bias,
+                "weights": {str(bucket): row for bucket, row in self.weights.items()},
+            }, f)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("hash_dim") != HASH_DIM:
+            raise ValueError(f"{path} was trained with a different feature size; retrain it")
+        weights = {int(bucket): row for bucket, row in data["weights"].items()}
+        return cls(classes=data["classes"], weights=weights, bias=data["bias"])
+
+
+def load_benchmark(path=BENCHMARK_PATH):
+    """(url, true_category) pairs from the benchmark suite."""
+    if not os.path.exists(path):
+        return []
+    with open(path, newline="") as f:
+        return [(row["url"], row["true_category"]) for row in csv.DictReader(f) if row.get("true_category")]
+
+
+def load_memory_examples(path=MEMORY_PATH, legacy_json=LEGACY_MEMORY_PATH):
+    """(url or domain, category) pairs from AX memory (any store engine), preferring ground-truth labels."""
+    if not os.path.exists(path) and not (legacy_json and os.path.exists(legacy_json)):
+        return []
+    store = open_store(path, legacy_json=legacy_json)
+    try:
+        examples = []
+        for url, entry in store.urls():
+            result = entry.get("result", {})
+            label = result.get("true_category") or result.get("category")
+            if label:
+                examples.append((url, label))
+        for domain, category in store.domain_categories():
+            examples.append((domain, category))
+    finally:
+        store.close()
+    return examples
+
+
+def train(memory_path=MEMORY_PATH, benchmark_path=BENCHMARK_PATH, model_path=MODEL_PATH):
+    examples = load_memory_examples(memory_path) + load_benchmark(benchmark_path)
+    if not examples:
+        raise ValueError(f"No labelled examples found in {memory_path} or {benchmark_path}")
+    model = LocalClassifier().fit(examples)
+    if model_path:
+        model.save(model_path)
+    return model, len(examples)
+
+
+def evaluate(model, examples, threshold=CONFIDENCE_THRESHOLD):
+    """Accuracy, confident-coverage and per-prediction latency (ms) over (text, label) pairs."""
+    correct = confident = confident_correct = 0
+    latencies = []
+    for text, label in examples:
+        start = time.perf_counter()
+        predicted, confidence = model.predict(text)
+        latencies.append((time.perf_counter() - start) * 1000)
+        correct += predicted == label
+        if confidence >= threshold:
+            confident += 1
+            confident_correct += predicted == label
+
+    latencies.sort()
+    total = len(examples) or 1
+    return {
+        "examples": len(examples),
+        "accuracy": correct / total,
+        "coverage": confident / total,
+        "confident_accuracy": confident_correct / confident if confident else 0.0,
+        "mean_ms": statistics.fmean(latencies) if latencies else 0.0,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+    }
+
+
+def cross_validate(memory_path=MEMORY_PATH, benchmark_path=BENCHMARK_PATH, folds=5, threshold=CONFIDENCE_THRESHOLD):
+    """Held-out accuracy on the benchmark: each fold is scored by a model that never saw its URLs."""
+    benchmark = load_benchmark(benchmark_path)
+    memory = load_memory_examples(memory_path)
+
+    predictions = []
+    for fold in range(folds):
+        test = benchmark[fold::folds]
+        test_hosts = {_host(url) for url, _ in test}
+        train_set = memory + [pair for i, pair in enumerate(benchmark) if i % folds != fold]
+        train_set = [(text, label) for text, label in train_set if _host(text) not in test_hosts]
+        model = LocalClassifier().fit(train_set)
+        predictions.append(evaluate(model, test, threshold))
+
+    total = sum(p["examples"] for p in predictions) or 1
+    return {
+        key: sum(p[key] * p["examples"] for p in predictions) / total
+        for key in ("accuracy", "coverage", "confident_accuracy", "mean_ms", "p95_ms")
+    } | {"examples": total}
+
+
+def _host(text):
+    return urlparse(text).netloc or text
+
+
+_shared_model = None
+_shared_lock = threading.Lock()
+
+
+def get_local_classifier(model_path=MODEL_PATH):
+    """Process-wide model: loaded from `model_path`, or trained from the default data on first use."""
+    global _shared_model
+    with _shared_lock:
+        if _shared_model is None:
+            if os.path.exists(model_path):
+                _shared_model = LocalClassifier.load(model_path)
+            else:
+                _shared_model, _ = train(model_path=model_path)
+        return _shared_model
+
+
+def _print_report(title, report):
+    print(f"{title}: {report['examples']} example(s)")
+    print(f"  accuracy           {report['accuracy']:.1%}")
+    print(f"  confident coverage {report['coverage']:.1%} (accuracy {report['confident_accuracy']:.1%})")
+    print(f"  latency            mean {report['mean_ms']:.2f} ms, p95 {report['p95_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local hashed n-gram category classifier")
+    parser.add_argument("command", choices=["train", "evaluate"])
+    parser.add_argument("--memory", default=MEMORY_PATH)
+    parser.add_argument("--benchmark", default=BENCHMARK_PATH)
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--folds", type=int, default=5, help="cross-validation folds for evaluate")
+    parser.add_argument("--threshold", type=float, default=CONFIDENCE_THRESHOLD)
+    args = parser.parse_args()
+
+    if args.command == "train":
+        start = time.perf_counter()
+        model, count = train(args.memory, args.benchmark, args.model)
+        print(f"Trained on {count} example(s) in {time.perf_counter() - start:.2f}s → {args.model}")
+        _print_report("Training set (benchmark)", evaluate(model, load_benchmark(args.benchmark), args.threshold))
+    else:
+        if os.path.exists(args.model):
+            model = LocalClassifier.load(args.model)
+            _print_report(f"Saved model {args.model} (benchmark, in-sample)",
+                          evaluate(model, load_benchmark(args.benchmark), args.threshold))
+        _print_report(f"{args.folds}-fold cross-validation (benchmark, held out)",
+                      cross_validate(args.memory, args.benchmark, args.folds, args.threshold))